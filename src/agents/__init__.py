@@ -1,12 +1,51 @@
-"""Agents package - imports all agents to ensure registration."""
+"""Agents package - declares all built-in agents with AgentFactory.
+
+Agent modules are listed in ``_manifest.py`` and imported on first use,
+so importing this package doesn't import every agent. Call
+ensure_registered() to import them up front.
+"""
+
+import importlib
+from typing import Any
+
+from src.core import AgentFactory
+from ._manifest import AGENT_MANIFEST
+
+AgentFactory.register_lazy(AGENT_MANIFEST)
+
+
+def ensure_registered(*agent_types: str):
+    """
+    Import agent modules so their @register_agent decorators run.
+
+    Args:
+        *agent_types: Agent types to register. If omitted, registers all
+            built-in agents.
+
+    Raises:
+        ValueError: If an agent type isn't in the manifest
+    """
+    for agent_type in agent_types or AGENT_MANIFEST:
+        if agent_type not in AGENT_MANIFEST:
+            raise ValueError(
+                f"Unknown agent type '{agent_type}'. "
+                f"Available types: {list(AGENT_MANIFEST.keys())}"
+            )
+        importlib.import_module(AGENT_MANIFEST[agent_type].partition(":")[0])
+
+
+def __getattr__(name: str) -> Any:
+    """Import agent classes on first access, e.g. ``from src.agents import HelloAgent``."""
+    for target in AGENT_MANIFEST.values():
+        module_name, _, class_name = target.partition(":")
+        if class_name == name:
+            return getattr(importlib.import_module(module_name), class_name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Import all agents to trigger their @register_agent decorators
-from .hello_agent.agent import HelloAgent
-from .router.agent import RouterAgent
-from .convo.agent import ConvoAgent
 
 __all__ = [
     "HelloAgent",
     "RouterAgent",
     "ConvoAgent",
+    "ensure_registered",
 ]
@@ -0,0 +1,14 @@
+"""Manifest of built-in agents.
+
+Maps each agent type to the "module:ClassName" that defines it. The module
+registers the agent (via @register_agent) when imported, so agents listed
+here are only imported once they are first needed.
+"""
+
+from typing import Dict
+
+AGENT_MANIFEST: Dict[str, str] = {
+    "hello_agent": "src.agents.hello_agent.agent:HelloAgent",
+    "router": "src.agents.router.agent:RouterAgent",
+    "convo": "src.agents.convo.agent:ConvoAgent",
+}
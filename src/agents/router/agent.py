@@ -29,6 +29,7 @@ class RouterAgent(BaseAgent):
         config_path: Optional[str] = None,
         default_agent: str = "hello_agent",
         confidence_threshold: float = 0.5,
+        pattern_backend: str = "re",
         **kwargs,
     ):
         super().__init__(
@@ -37,7 +38,9 @@ class RouterAgent(BaseAgent):
 
         # Initialize routing components
         self.engine = RoutingEngine(
-            default_agent=default_agent, confidence_threshold=confidence_threshold
+            default_agent=default_agent,
+            confidence_threshold=confidence_threshold,
+            pattern_backend=pattern_backend,
         )
         self.executor = RouteExecutor()
 
@@ -120,7 +123,8 @@ class RouterAgent(BaseAgent):
                 "agent": route_result.route_match.agent_type,
                 "strategy": route_result.route_match.strategy_name,
                 "confidence": route_result.route_match.confidence,
-                "metadata": route_result.route_match.metadata,
+                # Copied so the state owns a plain, JSON-serializable dict
+                "metadata": dict(route_result.route_match.metadata),
                 "is_fallback": route_result.fallback_agent is not None,
             }
             self.set_state("last_route", routing_info)
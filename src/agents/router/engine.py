@@ -1,16 +1,24 @@
 """Routing engine for orchestrating routing strategies."""
 
+from types import MappingProxyType
 from typing import Any, Dict, Optional
 from src.core import get_logger
 from .models import RouteResult, RouteMatch
+from .strategies.hyperscan import HyperscanStrategy
 from .strategies.metadata import MetadataBasedStrategy
 
+# Pattern backends mapped to the name of the strategy that implements them
+_PATTERN_STRATEGIES = {"re": "metadata", "hyperscan": "hyperscan"}
+
 
 class RoutingEngine:
     """Orchestrates routing strategies to determine which agent handles input."""
 
     def __init__(
-        self, default_agent: str = "hello_agent", confidence_threshold: float = 0.5
+        self,
+        default_agent: str = "hello_agent",
+        confidence_threshold: float = 0.5,
+        pattern_backend: str = "re",
     ):
         """
         Initialize routing engine.
@@ -18,9 +26,21 @@ class RoutingEngine:
         Args:
             default_agent: Fallback agent when no route matches
             confidence_threshold: Minimum confidence to accept a match (0.0-1.0)
+            pattern_backend: Regex engine for routing patterns: 're' or
+                'hyperscan' (requires the optional 'hyperscan' extra)
+
+        Raises:
+            ValueError: If pattern_backend is unknown
+            ImportError: If pattern_backend is 'hyperscan' but it isn't installed
         """
+        if pattern_backend not in _PATTERN_STRATEGIES:
+            raise ValueError(
+                f"Unknown pattern backend '{pattern_backend}'. "
+                f"Available backends: {list(_PATTERN_STRATEGIES)}"
+            )
         self.default_agent = default_agent
         self.confidence_threshold = confidence_threshold
+        self.pattern_backend = pattern_backend
         self.logger = get_logger("router.engine")
 
         # Initialize strategies
@@ -28,6 +48,12 @@ class RoutingEngine:
             "metadata": MetadataBasedStrategy(),
             # Future: 'llm_intent': LLMIntentStrategy()
         }
+        if pattern_backend == "hyperscan":
+            self.add_strategy("hyperscan", HyperscanStrategy())
+
+        # Every miss returns the same immutable result, so build it once
+        self._fallback_result: Optional[RouteResult] = None
+        self._get_fallback_result()
 
         self.logger.info(
             f"RoutingEngine initialized (default: {default_agent}, "
@@ -47,8 +73,11 @@ class RoutingEngine:
         """
         context = context or {}
 
-        # Try metadata strategy first
-        match = self.strategies["metadata"].match(input_data, context)
+        # Try metadata strategy first, on the configured pattern backend
+        strategy = self.strategies[_PATTERN_STRATEGIES[self.pattern_backend]]
+        match = strategy.match(
+            input_data, context, confidence_threshold=self.confidence_threshold
+        )
 
         if match.agent_type and match.confidence >= self.confidence_threshold:
             self.logger.info(
@@ -63,16 +92,31 @@ class RoutingEngine:
             f"using default: {self.default_agent}"
         )
 
-        return RouteResult(
-            matched=True,
-            route_match=RouteMatch(
-                agent_type=self.default_agent,
-                confidence=0.5,
-                metadata={"fallback": True, "reason": "no_match"},
-                strategy_name="default",
-            ),
-            fallback_agent=self.default_agent,
-        )
+        return self._get_fallback_result()
+
+    def _get_fallback_result(self) -> RouteResult:
+        """
+        Get the default-agent result, rebuilding it only if default_agent changed.
+
+        Returns:
+            RouteResult routing to the default agent
+        """
+        if (
+            self._fallback_result is None
+            or self._fallback_result.fallback_agent != self.default_agent
+        ):
+            self._fallback_result = RouteResult(
+                matched=True,
+                route_match=RouteMatch(
+                    agent_type=self.default_agent,
+                    confidence=0.5,
+                    # Read-only, since every miss hands out this same mapping
+                    metadata=MappingProxyType({"fallback": True, "reason": "no_match"}),
+                    strategy_name="default",
+                ),
+                fallback_agent=self.default_agent,
+            )
+        return self._fallback_result
 
     def add_strategy(self, name: str, strategy):
         """
@@ -1,20 +1,20 @@
 """Data models for router agent."""
 
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Mapping, Optional
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RouteMatch:
     """Represents a successful route match."""
 
     agent_type: str  # e.g., "hello_agent"
     confidence: float  # 0.0 to 1.0
-    metadata: Dict[str, Any]  # Pattern matched, keywords, etc.
+    metadata: Mapping[str, Any]  # Pattern matched, keywords, etc.
     strategy_name: str  # Which strategy produced this match
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class RouteResult:
     """Result of routing operation."""
 
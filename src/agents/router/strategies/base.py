@@ -1,7 +1,7 @@
 """Base class for routing strategies."""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from ..models import RouteMatch
 
 
@@ -9,13 +9,20 @@ class RoutingStrategy(ABC):
     """Abstract base class for routing strategies."""
 
     @abstractmethod
-    def match(self, input_data: Any, context: Dict[str, Any]) -> RouteMatch:
+    def match(
+        self,
+        input_data: Any,
+        context: Dict[str, Any],
+        confidence_threshold: Optional[float] = None,
+    ) -> RouteMatch:
         """
         Determine if strategy can route the input.
 
         Args:
             input_data: Input to be routed
             context: Additional routing context
+            confidence_threshold: Minimum confidence the caller will accept.
+                Strategies may skip work that can't produce such a match.
 
         Returns:
             RouteMatch with routing decision
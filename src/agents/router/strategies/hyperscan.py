@@ -0,0 +1,147 @@
+"""Hyperscan-backed routing strategy (requires the optional ``hyperscan`` package)."""
+
+import re
+import threading
+from typing import Any, List, Optional, Tuple
+from src.core import get_logger
+from .metadata import MetadataBasedStrategy, _RoutingIndex
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+HYPERSCAN_AVAILABLE = hyperscan is not None
+
+# Python regex flags that have a Hyperscan equivalent; anything else
+# (MULTILINE, VERBOSE, ...) keeps the pattern phase on the re module.
+_SUPPORTED_FLAGS = re.IGNORECASE | re.UNICODE
+
+
+class HyperscanStrategy(MetadataBasedStrategy):
+    """
+    Metadata strategy whose pattern phase runs on a Hyperscan database.
+
+    All routable patterns are compiled into one database, with ids in the
+    same priority/declaration order the metadata strategy uses, so the
+    lowest id reported by a scan is the pattern that strategy would have
+    picked. Keyword matching is inherited unchanged. If Hyperscan rejects
+    any pattern (e.g. backreferences or lookaround), matching falls back
+    to the re-based search for that set of patterns.
+    """
+
+    strategy_name = "hyperscan"
+
+    def __init__(self):
+        if hyperscan is None:
+            raise ImportError(
+                "HyperscanStrategy requires the 'hyperscan' package "
+                "(install the 'hyperscan' extra)"
+            )
+        super().__init__()
+        self.logger = get_logger("router.strategy.hyperscan")
+        # (index, database or None), replaced in one assignment so a scan
+        # never pairs one index's database with another index's targets
+        self._database_entry: Optional[Tuple[_RoutingIndex, Any]] = None
+        # Scratch space can't be shared between concurrent scans
+        self._local = threading.local()
+
+    def _search_patterns(
+        self, index: _RoutingIndex, input_str: str
+    ) -> Optional[Tuple[str, re.Pattern]]:
+        """
+        Scan the input once against every pattern.
+
+        Args:
+            index: Routing index for the current metadata
+            input_str: Input to search
+
+        Returns:
+            Tuple of (agent_type, pattern), or None if nothing matched
+        """
+        if not index.targets:
+            return None
+        database = self._get_database(index)
+        if database is None:
+            return index.search(input_str)
+        try:
+            data = input_str.encode("utf-8")
+        except UnicodeEncodeError:
+            # e.g. lone surrogates, which UTF-8 mode can't scan
+            return index.search(input_str)
+
+        hits: List[int] = []
+        database.scan(
+            data,
+            match_event_handler=lambda pattern_id, start, end, flags, context: hits.append(
+                pattern_id
+            ),
+            scratch=self._get_scratch(database),
+        )
+        if not hits:
+            return None
+        agent_type, pattern, _ = index.targets[min(hits)]
+        return agent_type, pattern
+
+    def _get_database(self, index: _RoutingIndex):
+        """
+        Get the compiled database for an index, building it on first use.
+
+        Args:
+            index: Routing index to compile
+
+        Returns:
+            Hyperscan database, or None if the patterns can't be compiled
+        """
+        entry = self._database_entry
+        if entry is not None and entry[0] is index:
+            return entry[1]
+        database = self._compile(index)
+        self._database_entry = (index, database)
+        return database
+
+    def _compile(self, index: _RoutingIndex):
+        """
+        Compile an index's patterns into a block-mode database.
+
+        Args:
+            index: Routing index to compile
+
+        Returns:
+            Hyperscan database, or None if the patterns can't be compiled
+        """
+        expressions = []
+        flags = []
+        for _, pattern, _ in index.targets:
+            if not isinstance(pattern.pattern, str) or pattern.flags & ~_SUPPORTED_FLAGS:
+                return None
+            expressions.append(pattern.pattern.encode("utf-8"))
+            pattern_flags = (
+                hyperscan.HS_FLAG_SINGLEMATCH
+                | hyperscan.HS_FLAG_UTF8
+                | hyperscan.HS_FLAG_UCP
+                | hyperscan.HS_FLAG_ALLOWEMPTY
+            )
+            if pattern.flags & re.IGNORECASE:
+                pattern_flags |= hyperscan.HS_FLAG_CASELESS
+            flags.append(pattern_flags)
+
+        database = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        try:
+            database.compile(
+                expressions=expressions,
+                ids=list(range(len(expressions))),
+                elements=len(expressions),
+                flags=flags,
+            )
+        except hyperscan.error as e:
+            self.logger.warning(f"Hyperscan can't compile routing patterns, using re: {e}")
+            return None
+        return database
+
+    def _get_scratch(self, database):
+        """Get this thread's scratch space for the database."""
+        if getattr(self._local, "database", None) is not database:
+            self._local.scratch = hyperscan.Scratch(database)
+            self._local.database = database
+        return self._local.scratch
@@ -1,19 +1,196 @@
 """Metadata-based routing strategy."""
 
 import re
-from typing import Any, Dict
+from typing import Any, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
 from src.core import AgentFactory, get_logger
 from .base import RoutingStrategy
 from ..models import RouteMatch
 
+# Flags a pattern may carry and still be fused into the anchored regex;
+# e.g. MULTILINE would let ``^`` match after a newline
+_COMBINABLE_FLAGS = re.IGNORECASE | re.UNICODE
+# Keyword matches score at most this (all of an agent's keywords present)
+_MAX_KEYWORD_CONFIDENCE = 0.8
+# Patterns that are nothing but an anchored ASCII literal, optionally
+# followed by a word boundary, e.g. ``^hello\b``
+_LITERAL_PREFIX = re.compile(r"\^((?:[A-Za-z0-9 _,'-]|\\[^A-Za-z0-9])+)(\\b)?")
+_ESCAPED_CHAR = re.compile(r"\\(.)")
+# Routing patterns compiled by this module, keyed by source. Unlike re's
+# own cache (512 entries, shared with everything else) it is never evicted.
+_PATTERN_CACHE: Dict[str, re.Pattern] = {}
+
+
+def _compile(pattern: str) -> re.Pattern:
+    """
+    Compile a routing pattern case-insensitively, reusing earlier results.
+
+    Args:
+        pattern: Regex source
+
+    Returns:
+        Compiled pattern
+
+    Raises:
+        re.error: If the pattern is invalid
+    """
+    compiled = _PATTERN_CACHE.get(pattern)
+    if compiled is None:
+        compiled = _PATTERN_CACHE[pattern] = re.compile(pattern, re.IGNORECASE)
+    return compiled
+
+
+def _extract_prefix(pattern: str) -> Optional[Tuple[str, bool]]:
+    """
+    Extract the literal from patterns of the form ``^literal`` or ``^literal\\b``.
+
+    Args:
+        pattern: Regex source
+
+    Returns:
+        Tuple of (lowercased literal, needs word boundary), or None if the
+        pattern is anything more than an anchored literal
+    """
+    m = _LITERAL_PREFIX.fullmatch(pattern)
+    if m is None:
+        return None
+    literal = _ESCAPED_CHAR.sub(r"\1", m.group(1))
+    return literal.lower(), m.group(2) is not None
+
+
+class _RoutingIndex:
+    """Routing data derived from one snapshot of agent metadata.
+
+    Targets are the (agent, pattern) pairs ordered by agent priority and
+    then declaration order. Anchored literal patterns such as ``^hello\\b``
+    can only match at position 0, so they are fused into one regex,
+    ``^(?:(p0)|(p3)|...)``, that is tried once against the start of the
+    input. Every other pattern runs through its own ``Pattern.search``,
+    which keeps re's literal-prefix scan, and only patterns ahead of the
+    first anchored hit are searched.
+
+    Keywords from all agents are pooled, so each is looked for in the
+    input once however many agents declare it.
+    """
+
+    def __init__(
+        self,
+        sorted_agents: List[Tuple[str, Dict[str, Any]]],
+        patterns_by_agent: Dict[str, List[re.Pattern]],
+    ):
+        self.sorted_agents = sorted_agents
+        # (agent_type, pattern, literal prefix or None)
+        self.targets: List[Tuple[str, re.Pattern, Optional[Tuple[str, bool]]]] = [
+            (
+                agent_type,
+                pattern,
+                _extract_prefix(pattern.pattern)
+                if isinstance(pattern.pattern, str)
+                and pattern.flags & re.IGNORECASE
+                and not pattern.flags & ~_COMBINABLE_FLAGS
+                else None,
+            )
+            for agent_type, _ in sorted_agents
+            for pattern in patterns_by_agent[agent_type]
+        ]
+        # Target positions of the anchored literals, in alternative order;
+        # the literals contain no groups, so m.lastindex - 1 indexes this
+        self.anchored_positions: List[int] = [
+            position
+            for position, (_, _, prefix) in enumerate(self.targets)
+            if prefix is not None
+        ]
+        self.unanchored_positions: List[int] = [
+            position
+            for position, (_, _, prefix) in enumerate(self.targets)
+            if prefix is None
+        ]
+        self.anchored: Optional[re.Pattern] = None
+        if self.anchored_positions:
+            alternatives = "|".join(
+                f"({self.targets[position][1].pattern})"
+                for position in self.anchored_positions
+            )
+            # Not via _compile: the index owns this regex, and caching it would
+            # keep one alive per registry change for the life of the process
+            self.anchored = re.compile(f"^(?:{alternatives})", re.IGNORECASE)
+        # Only agents that declare keywords take part in the keyword phase;
+        # each carries its lowercased keyword set for intersection
+        self.keyword_agents: List[Tuple[str, Dict[str, Any], FrozenSet[str]]] = [
+            (agent_type, metadata, frozenset(kw.lower() for kw in metadata["keywords"]))
+            for agent_type, metadata in sorted_agents
+            if metadata.get("keywords")
+        ]
+        # Every agent's keywords, each checked once per input
+        self.keywords: FrozenSet[str] = frozenset().union(
+            *(keyword_set for _, _, keyword_set in self.keyword_agents)
+        )
+
+    def find_keywords(self, input_lower: str) -> Set[str]:
+        """
+        Find which keywords occur in the input.
+
+        Args:
+            input_lower: Lowercased input
+
+        Returns:
+            Set of keywords found as substrings of the input
+        """
+        return {keyword for keyword in self.keywords if keyword in input_lower}
+
+    def search(self, input_str: str) -> Optional[Tuple[str, re.Pattern]]:
+        """
+        Find the highest-priority (agent, pattern) pair matching the input.
+
+        Args:
+            input_str: Input to search
+
+        Returns:
+            Tuple of (agent_type, pattern), or None if nothing matched
+        """
+        first_anchored = len(self.targets)
+        if self.anchored is not None:
+            m = self.anchored.match(input_str)
+            if m is not None:
+                first_anchored = self.anchored_positions[m.lastindex - 1]
+
+        for position in self.unanchored_positions:
+            if position > first_anchored:
+                break
+            agent_type, pattern, _ = self.targets[position]
+            if pattern.search(input_str) is not None:
+                return agent_type, pattern
+
+        if first_anchored < len(self.targets):
+            agent_type, pattern, _ = self.targets[first_anchored]
+            return agent_type, pattern
+        return None
+
 
 class MetadataBasedStrategy(RoutingStrategy):
     """Routing strategy that uses agent metadata from AgentFactory."""
 
+    strategy_name = "metadata"
+
     def __init__(self):
         self.logger = get_logger("router.strategy.metadata")
+        # (metadata mapping, registry version, index), replaced in one
+        # assignment so concurrent callers never see a mismatched triple
+        self._index_entry: Optional[
+            Tuple[Mapping[str, Dict[str, Any]], int, _RoutingIndex]
+        ] = None
 
-    def match(self, input_data: Any, context: Dict[str, Any]) -> RouteMatch:
+    @property
+    def _index(self) -> Optional[_RoutingIndex]:
+        """The most recently built routing index, if any."""
+        entry = self._index_entry
+        return entry[2] if entry is not None else None
+
+    def match(
+        self,
+        input_data: Any,
+        context: Dict[str, Any],
+        confidence_threshold: Optional[float] = None,
+    ) -> RouteMatch:
         """
         Match input against all registered agents' patterns and keywords.
 
@@ -25,65 +202,63 @@ class MetadataBasedStrategy(RoutingStrategy):
         Args:
             input_data: Input to be routed
             context: Additional routing context
+            confidence_threshold: Minimum confidence the caller will accept.
+                Above the best possible keyword score, only patterns are tried.
 
         Returns:
             RouteMatch with routing decision
         """
         input_str = str(input_data).strip()
 
-        # Get all routable agents sorted by priority (highest first)
-        agents_metadata = AgentFactory.get_routable_agents()
-        sorted_agents = sorted(
-            agents_metadata.items(), key=lambda x: x[1].get("priority", 0), reverse=True
-        )
+        index = self._get_index(AgentFactory.get_routable_agents())
+
+        # A pattern match (confidence 1.0) always beats keyword matches (<= 0.8)
+        hit = self._search_patterns(index, input_str)
+        if hit is not None:
+            agent_type, pattern = hit
+            self.logger.info(f"Matched {agent_type} with confidence 1.00")
+            return RouteMatch(
+                agent_type=agent_type,
+                confidence=1.0,
+                metadata={"matched_pattern": pattern.pattern, "match_type": "pattern"},
+                strategy_name=self.strategy_name,
+            )
+
+        if not index.keyword_agents or (
+            confidence_threshold is not None
+            and confidence_threshold > _MAX_KEYWORD_CONFIDENCE
+        ):
+            return RouteMatch(None, 0.0, {}, self.strategy_name)
+
+        found_keywords = index.find_keywords(input_str.lower())
+        if not found_keywords:
+            # Common case for unrelated input: no agent can score
+            return RouteMatch(None, 0.0, {}, self.strategy_name)
 
         matches = []
 
-        for agent_type, metadata in sorted_agents:
-            # Check pattern matching
-            patterns = metadata.get("patterns", [])
-            for pattern in patterns:
-                try:
-                    if re.search(pattern, input_str, re.IGNORECASE):
-                        confidence = 1.0  # Exact pattern match
-                        matches.append(
-                            (
-                                agent_type,
-                                confidence,
-                                {"matched_pattern": pattern, "match_type": "pattern"},
-                                metadata.get("priority", 0),
-                            )
-                        )
-                        break  # Found a match for this agent
-                except re.error as e:
-                    self.logger.warning(
-                        f"Invalid regex pattern '{pattern}' for {agent_type}: {e}"
-                    )
+        for agent_type, metadata, keyword_set in index.keyword_agents:
+            # Check keyword matching
+            hits = keyword_set & found_keywords
 
-            # Check keyword matching (only if no pattern matched)
-            if not matches or matches[-1][0] != agent_type:
-                keywords = metadata.get("keywords", [])
-                matched_keywords = [
-                    kw for kw in keywords if kw.lower() in input_str.lower()
-                ]
-
-                if matched_keywords:
-                    # Confidence based on keyword match ratio
-                    confidence = len(matched_keywords) / max(len(keywords), 1) * 0.8
-                    matches.append(
-                        (
-                            agent_type,
-                            confidence,
-                            {
-                                "matched_keywords": matched_keywords,
-                                "match_type": "keyword",
-                            },
-                            metadata.get("priority", 0),
-                        )
+            if hits:
+                matched_keywords = sorted(hits)
+                # Confidence based on keyword match ratio
+                confidence = len(hits) / len(keyword_set) * _MAX_KEYWORD_CONFIDENCE
+                matches.append(
+                    (
+                        agent_type,
+                        confidence,
+                        {
+                            "matched_keywords": matched_keywords,
+                            "match_type": "keyword",
+                        },
+                        metadata.get("priority", 0),
                     )
+                )
 
         if not matches:
-            return RouteMatch(None, 0.0, {}, "metadata")
+            return RouteMatch(None, 0.0, {}, self.strategy_name)
 
         # Return highest confidence match (with priority as tiebreaker)
         best_match = max(
@@ -97,5 +272,101 @@ class MetadataBasedStrategy(RoutingStrategy):
             agent_type=agent_type,
             confidence=confidence,
             metadata=metadata,
-            strategy_name="metadata",
+            strategy_name=self.strategy_name,
         )
+
+    def _search_patterns(
+        self, index: _RoutingIndex, input_str: str
+    ) -> Optional[Tuple[str, re.Pattern]]:
+        """
+        Run the pattern phase; subclasses may swap in another matcher.
+
+        Args:
+            index: Routing index for the current metadata
+            input_str: Input to search
+
+        Returns:
+            Tuple of (agent_type, pattern), or None if nothing matched
+        """
+        return index.search(input_str)
+
+    def _get_index(self, agents_metadata: Mapping[str, Dict[str, Any]]) -> _RoutingIndex:
+        """
+        Get the routing index for the given metadata, rebuilding it only when
+        the registry version changes or a different mapping is passed in.
+
+        AgentFactory.get_routable_agents() returns the same mapping until
+        the registry changes, so the steady-state check is an identity test.
+
+        Args:
+            agents_metadata: Routable agents mapped to their metadata
+
+        Returns:
+            Routing index for the metadata
+        """
+        version = AgentFactory.get_version()
+        entry = self._index_entry
+        if entry is not None and entry[0] is agents_metadata and entry[1] == version:
+            return entry[2]
+
+        # Sorted by priority (highest first); ties keep registration order.
+        # Reuse the factory's presorted order when it describes exactly
+        # this mapping, otherwise (e.g. patched metadata) sort here.
+        presorted = AgentFactory.get_routable_agents_sorted()
+        if len(presorted) == len(agents_metadata) and all(
+            agents_metadata.get(agent_type) is metadata for agent_type, metadata in presorted
+        ):
+            sorted_agents = list(presorted)
+        else:
+            sorted_agents = sorted(
+                agents_metadata.items(), key=lambda x: x[1].get("priority", 0), reverse=True
+            )
+        patterns_by_agent = {
+            agent_type: self._get_patterns(agent_type, metadata)
+            for agent_type, metadata in sorted_agents
+        }
+        index = _RoutingIndex(sorted_agents, patterns_by_agent)
+        self._index_entry = (agents_metadata, version, index)
+        return index
+
+    def _get_patterns(self, agent_type: str, metadata: Dict[str, Any]) -> List[re.Pattern]:
+        """
+        Get compiled patterns for an agent.
+
+        Metadata registered with AgentFactory already has its patterns
+        compiled; any other metadata (e.g. supplied directly) is coerced.
+
+        Args:
+            agent_type: Agent type the metadata belongs to
+            metadata: Agent routing metadata
+
+        Returns:
+            List of compiled patterns
+        """
+        if metadata is AgentFactory.get_metadata(agent_type):
+            return AgentFactory.get_compiled_patterns(agent_type)
+        return self._coerce_patterns(agent_type, metadata.get("patterns", []))
+
+    def _coerce_patterns(self, agent_type: str, patterns: List[Any]) -> List[re.Pattern]:
+        """
+        Compile pattern strings, passing through already-compiled patterns.
+
+        Args:
+            agent_type: Agent type the patterns belong to (for logging)
+            patterns: Pattern strings or compiled patterns
+
+        Returns:
+            List of compiled patterns, skipping invalid ones
+        """
+        compiled = []
+        for pattern in patterns:
+            if isinstance(pattern, re.Pattern):
+                compiled.append(pattern)
+                continue
+            try:
+                compiled.append(_compile(pattern))
+            except re.error as e:
+                self.logger.warning(
+                    f"Invalid regex pattern '{pattern}' for {agent_type}: {e}"
+                )
+        return compiled
@@ -9,7 +9,7 @@ from src.core import AgentFactory, BaseAgent
 from src.core.db import DatabaseManager
 from src.core.memory import MemoryService
 from src.core.tools import ToolRegistry
-# Import all agents to ensure they are registered
+# Declare all agents with the factory (imported on first use)
 import src.agents
 # Import all tools to ensure they are registered
 import src.tools
@@ -5,7 +5,7 @@ from pathlib import Path
 
 from rich.console import Console
 
-# Import agents to ensure registration
+# Declare agents with the factory (imported on first use)
 import src.agents  # noqa: F401
 from src.core import AgentFactory
 
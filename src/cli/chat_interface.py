@@ -9,7 +9,7 @@ from rich.markdown import Markdown
 from rich.live import Live
 from rich.spinner import Spinner
 
-# Import agents to ensure registration
+# Declare agents with the factory (imported on first use)
 import src.agents  # noqa: F401
 from src.core import AgentFactory
 
@@ -1,10 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Type, TYPE_CHECKING
+from collections import deque
+from types import MappingProxyType
+from typing import Deque, Dict, Any, Optional, List, Mapping, Type, TYPE_CHECKING
+import importlib
 import json
+import re
+import sys
+import threading
 
 from .client import AIClientWrapper, ClientFactory
 from .logger import get_logger
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 if TYPE_CHECKING:
     from .memory import MemoryService
     from .tools.registry import ToolRegistry
@@ -33,6 +44,7 @@ class BaseAgent(ABC):
         memory_service: Optional["MemoryService"] = None,
         tools: Optional[List[str]] = None,
         enable_tools: bool = False,
+        tool_history_maxlen: Optional[int] = 1024,
         **kwargs,
     ):
         """
@@ -47,6 +59,9 @@ class BaseAgent(ABC):
             memory_service: Optional MemoryService for persistence. If None, no persistence.
             tools: List of tool names this agent can use. If None, no tools available.
             enable_tools: Whether to enable tool calling. Default: False.
+            tool_history_maxlen: Maximum number of tool executions kept in
+                tool_history; the oldest are dropped first. None keeps all.
+                Default: 1024.
             **kwargs: Additional arguments passed to the AI client
         """
         self.name = name
@@ -81,7 +96,11 @@ class BaseAgent(ABC):
         self.enable_tools = enable_tools
         self.available_tools = tools or []
         self.tool_executor = None
-        self.tool_history: List[Dict] = []
+        self.tool_history: Deque[Dict] = deque(maxlen=tool_history_maxlen)
+        # Schemas for available_tools, reused across chat_with_tools calls
+        # until the tool list or the tool registry changes
+        self._tool_schemas: List[Dict[str, Any]] = []
+        self._tool_schemas_key: Optional[tuple] = None
 
         if self.enable_tools:
             from .tools.executor import ToolExecutor
@@ -347,10 +366,10 @@ class BaseAgent(ABC):
             # Fall back to regular chat if tools not enabled
             return self.chat(message, **kwargs)
 
-        from .tools.registry import ToolRegistry
-
         messages = self._build_messages_with_history(message)
-        tool_schemas = ToolRegistry.get_schemas(self.available_tools)
+        tool_schemas = self._get_tool_schemas()
+        # Parsed arguments by raw JSON string; loops often repeat a call
+        parsed_arguments: Dict[str, Dict[str, Any]] = {}
 
         for iteration in range(max_tool_iterations):
             self.logger.debug(f"Tool iteration {iteration + 1}/{max_tool_iterations}")
@@ -394,7 +413,11 @@ class BaseAgent(ABC):
             # Execute each tool call
             for tool_call in assistant_message.tool_calls:
                 tool_name = tool_call.function.name
-                tool_params = json.loads(tool_call.function.arguments)
+                arguments = tool_call.function.arguments
+                tool_params = parsed_arguments.get(arguments)
+                if tool_params is None:
+                    tool_params = _loads_json(arguments)
+                    parsed_arguments[arguments] = tool_params
 
                 self.logger.info(f"Executing tool: {tool_name}")
 
@@ -433,6 +456,22 @@ class BaseAgent(ABC):
         self.logger.warning(f"Max tool iterations ({max_tool_iterations}) reached")
         return response
 
+    def _get_tool_schemas(self) -> List[Dict[str, Any]]:
+        """
+        Get function calling schemas for available_tools, building them only
+        when the tool list or the tool registry has changed.
+
+        Returns:
+            List of tool schema dictionaries
+        """
+        from .tools.registry import ToolRegistry
+
+        key = (tuple(self.available_tools), ToolRegistry.get_version())
+        if key != self._tool_schemas_key:
+            self._tool_schemas = ToolRegistry.get_schemas(self.available_tools)
+            self._tool_schemas_key = key
+        return self._tool_schemas
+
     def __repr__(self) -> str:
         return (
             f"{self.__class__.__name__}(name='{self.name}', "
@@ -441,6 +480,13 @@ class BaseAgent(ABC):
         )
 
 
+def _loads_json(data: str) -> Any:
+    """Parse JSON with orjson when it's installed, else the json module."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 class AgentFactory:
     """
     Factory class for creating and managing agent instances.
@@ -453,6 +499,20 @@ class AgentFactory:
 
     _registered_agents: Dict[str, Type[BaseAgent]] = {}
     _agent_metadata: Dict[str, Dict[str, Any]] = {}
+    # Routing regexes compiled once at registration. Kept out of the public
+    # metadata so that stays JSON-serializable for the API and CLI.
+    _compiled_patterns: Dict[str, List[re.Pattern]] = {}
+    # Bumped on every register/unregister so routing caches can detect changes
+    _version: int = 0
+    _routable_cache: Optional[Mapping[str, Dict[str, Any]]] = None
+    _routable_sorted: tuple = ()
+    _routable_cache_version: int = -1
+    # Agents declared via register_lazy() whose modules haven't been imported
+    # yet, mapped to their "module:ClassName" target
+    _lazy_agents: Dict[str, str] = {}
+    # Held while a lazy agent's module is imported, so concurrent lookups
+    # wait for its registration instead of seeing neither entry
+    _lazy_lock = threading.RLock()
 
     @classmethod
     def register(
@@ -472,8 +532,79 @@ class AgentFactory:
         if not issubclass(agent_class, BaseAgent):
             raise TypeError(f"{agent_class} must inherit from BaseAgent")
 
+        # Interned so routing comparisons against registry keys are pointer checks
+        agent_type = sys.intern(agent_type)
         cls._registered_agents[agent_type] = agent_class
         cls._agent_metadata[agent_type] = metadata or {}
+        cls._compiled_patterns[agent_type] = cls._compile_patterns(
+            agent_type, cls._agent_metadata[agent_type].get("patterns", [])
+        )
+        cls._lazy_agents.pop(agent_type, None)
+        cls._version += 1
+
+    @classmethod
+    def register_lazy(cls, agents: Mapping[str, str]):
+        """
+        Declare agents whose modules are only imported when first needed.
+
+        The module is imported the first time the agent is looked up
+        (create, get_metadata, is_registered) or the whole registry is
+        listed, and is expected to register the agent itself, e.g. via
+        @register_agent.
+
+        Args:
+            agents: Agent types mapped to "module:ClassName" targets
+        """
+        for agent_type, target in agents.items():
+            if agent_type not in cls._registered_agents:
+                cls._lazy_agents[agent_type] = target
+
+    @classmethod
+    def _load_lazy(cls, agent_type: Optional[str] = None):
+        """
+        Import the modules of lazily declared agents.
+
+        Args:
+            agent_type: Agent type to load. If None, loads all pending agents.
+
+        Raises:
+            ImportError: If an agent's module can't be imported
+        """
+        if not cls._lazy_agents:
+            return
+        if agent_type is not None and agent_type not in cls._lazy_agents:
+            return
+        with cls._lazy_lock:
+            pending = list(cls._lazy_agents) if agent_type is None else [agent_type]
+            for pending_type in pending:
+                target = cls._lazy_agents.get(pending_type)
+                if target is None:
+                    continue
+                # Left pending if the import fails, so a later lookup retries
+                importlib.import_module(target.partition(":")[0])
+                cls._lazy_agents.pop(pending_type, None)
+
+    @staticmethod
+    def _compile_patterns(agent_type: str, patterns: List[str]) -> List[re.Pattern]:
+        """
+        Compile routing patterns case-insensitively, skipping invalid ones.
+
+        Args:
+            agent_type: Agent type the patterns belong to (for logging)
+            patterns: Regex pattern strings
+
+        Returns:
+            List of compiled patterns in declaration order
+        """
+        compiled = []
+        for pattern in patterns:
+            try:
+                compiled.append(re.compile(pattern, re.IGNORECASE))
+            except re.error as e:
+                get_logger("agent.factory").warning(
+                    f"Invalid regex pattern '{pattern}' for {agent_type}: {e}"
+                )
+        return compiled
 
     @classmethod
     def create(
@@ -506,10 +637,11 @@ class AgentFactory:
         Raises:
             ValueError: If agent_type is not registered
         """
+        cls._load_lazy(agent_type)
         if agent_type not in cls._registered_agents:
             raise ValueError(
                 f"Agent type '{agent_type}' not registered. "
-                f"Available types: {list(cls._registered_agents.keys())}"
+                f"Available types: {list(cls._registered_agents) + list(cls._lazy_agents)}"
             )
 
         agent_class = cls._registered_agents[agent_type]
@@ -571,6 +703,7 @@ class AgentFactory:
         Returns:
             List of registered agent type names
         """
+        cls._load_lazy()
         return list(cls._registered_agents.keys())
 
     @classmethod
@@ -584,6 +717,7 @@ class AgentFactory:
         Returns:
             True if registered, False otherwise
         """
+        cls._load_lazy(agent_type)
         return agent_type in cls._registered_agents
 
     @classmethod
@@ -598,6 +732,9 @@ class AgentFactory:
             del cls._registered_agents[agent_type]
         if agent_type in cls._agent_metadata:
             del cls._agent_metadata[agent_type]
+        cls._compiled_patterns.pop(agent_type, None)
+        cls._lazy_agents.pop(agent_type, None)
+        cls._version += 1
 
     @classmethod
     def get_metadata(cls, agent_type: str) -> Dict[str, Any]:
@@ -610,8 +747,33 @@ class AgentFactory:
         Returns:
             Agent metadata dictionary
         """
+        cls._load_lazy(agent_type)
         return cls._agent_metadata.get(agent_type, {})
 
+    @classmethod
+    def get_version(cls) -> int:
+        """
+        Get the registry version, which changes whenever agents are
+        registered or unregistered.
+
+        Returns:
+            Monotonically increasing registry version
+        """
+        return cls._version
+
+    @classmethod
+    def get_compiled_patterns(cls, agent_type: str) -> List[re.Pattern]:
+        """
+        Get the routing patterns compiled when the agent was registered.
+
+        Args:
+            agent_type: Agent type to get patterns for
+
+        Returns:
+            List of compiled, case-insensitive patterns (empty if unknown)
+        """
+        return cls._compiled_patterns.get(agent_type, [])
+
     @classmethod
     def get_all_metadata(cls) -> Dict[str, Dict[str, Any]]:
         """
@@ -620,24 +782,58 @@ class AgentFactory:
         Returns:
             Dictionary mapping agent types to their metadata
         """
+        cls._load_lazy()
         return {
             agent_type: cls.get_metadata(agent_type)
             for agent_type in cls._registered_agents.keys()
         }
 
     @classmethod
-    def get_routable_agents(cls) -> Dict[str, Dict[str, Any]]:
+    def get_routable_agents(cls) -> Mapping[str, Dict[str, Any]]:
         """
         Get all agents that are enabled for routing.
 
+        The mapping is built once per registry version and the same
+        read-only object is returned until an agent is registered or
+        unregistered.
+
         Returns:
-            Dictionary mapping agent types to their metadata for enabled agents
+            Read-only mapping of agent types to their metadata for enabled agents
         """
-        return {
+        cls._refresh_routable_cache()
+        return cls._routable_cache
+
+    @classmethod
+    def get_routable_agents_sorted(cls) -> tuple:
+        """
+        Get routable agents ordered by priority, highest first.
+
+        Agents with equal priority keep registration order. Like
+        get_routable_agents(), the result is cached per registry version.
+
+        Returns:
+            Tuple of (agent_type, metadata) pairs
+        """
+        cls._refresh_routable_cache()
+        return cls._routable_sorted
+
+    @classmethod
+    def _refresh_routable_cache(cls):
+        """Rebuild the routable-agent caches if the registry has changed."""
+        cls._load_lazy()
+        if cls._routable_cache_version == cls._version:
+            return
+
+        routable = {
             agent_type: metadata
             for agent_type, metadata in cls._agent_metadata.items()
             if metadata.get("enabled", True)
         }
+        cls._routable_cache = MappingProxyType(routable)
+        cls._routable_sorted = tuple(
+            sorted(routable.items(), key=lambda x: x[1].get("priority", 0), reverse=True)
+        )
+        cls._routable_cache_version = cls._version
 
 
 # Decorator for easy agent registration
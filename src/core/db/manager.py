@@ -28,22 +28,37 @@ class DatabaseManager:
 
     _instance = None
     _lock = threading.Lock()
-    _local = threading.local()
 
-    def __new__(cls, db_path: Optional[str] = None):
-        """Singleton pattern with thread-safe initialization."""
+    def __new__(cls, db_path: Optional[str] = None, _force_new: bool = False):
+        """Singleton pattern with thread-safe initialization.
+
+        Passing ``_force_new=True`` returns an independent instance that
+        neither reuses nor replaces the shared singleton (used by tests).
+        """
+        if _force_new:
+            return cls._create()
         if cls._instance is None:
             with cls._lock:
                 if cls._instance is None:
-                    cls._instance = super().__new__(cls)
-                    cls._instance._initialized = False
+                    cls._instance = cls._create()
         return cls._instance
 
-    def __init__(self, db_path: Optional[str] = None):
+    @classmethod
+    def _create(cls) -> "DatabaseManager":
+        """Allocate an uninitialized instance with its own thread-local storage."""
+        instance = super().__new__(cls)
+        instance._initialized = False
+        instance._local = threading.local()
+        return instance
+
+    def __init__(self, db_path: Optional[str] = None, _force_new: bool = False):
         """Initialize database manager.
 
         Args:
             db_path: Path to SQLite database file. If None, uses default location.
+                ``":memory:"`` gives a private in-memory database per
+                thread-local connection, which suits single-threaded tests.
+            _force_new: Bypass the singleton and build a fresh instance.
         """
         if self._initialized:
             return
@@ -55,7 +70,8 @@ class DatabaseManager:
         self._initialized = True
 
         # Ensure directory exists
-        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        if self.db_path != ":memory:":
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
 
         # Initialize schema
         self._init_schema()
@@ -136,8 +152,24 @@ class DatabaseManager:
             with db.transaction():
                 db.add_message(...)
                 db.set_state(...)
+
+        When nested inside another ``transaction()`` or ``savepoint()``, the
+        block runs in its own SAVEPOINT and leaves committing to the outer
+        scope.
         """
         conn = self._get_connection()
+        if self._in_transaction():
+            conn.execute("SAVEPOINT nested_transaction")
+            try:
+                yield conn
+            except Exception as e:
+                conn.execute("ROLLBACK TO nested_transaction")
+                conn.execute("RELEASE nested_transaction")
+                logger.error(f"Nested transaction rolled back: {e}")
+                raise
+            conn.execute("RELEASE nested_transaction")
+            return
+
         # Set transaction flag
         self._local.in_transaction = True
         try:
@@ -151,6 +183,30 @@ class DatabaseManager:
             # Clear transaction flag
             self._local.in_transaction = False
 
+    @contextmanager
+    def savepoint(self):
+        """Context manager that discards every write made inside it.
+
+        Opens a SAVEPOINT and always rolls back to it on exit, which lets
+        test fixtures share one database while isolating each test.
+
+        Usage:
+            with db.savepoint():
+                db.create_conversation(...)
+            # conversation is gone here
+        """
+        conn = self._get_connection()
+        previous = self._in_transaction()
+        self._local.in_transaction = True
+        conn.execute("SAVEPOINT rollback_scope")
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK TO rollback_scope")
+                conn.execute("RELEASE rollback_scope")
+            self._local.in_transaction = previous
+
     def close(self):
         """Close thread-local connection."""
         if hasattr(self._local, 'connection') and self._local.connection is not None:
@@ -167,6 +223,7 @@ class DatabaseManager:
         model: Optional[str] = None,
         title: Optional[str] = None,
         metadata: Optional[Dict[str, Any]] = None,
+        conversation_id: Optional[str] = None,
     ) -> str:
         """Create a new conversation.
 
@@ -176,11 +233,13 @@ class DatabaseManager:
             model: Model name.
             title: Conversation title (auto-generated if None).
             metadata: Additional metadata as dict.
+            conversation_id: Explicit conversation ID. If None, a UUID is generated.
 
         Returns:
-            Conversation ID (UUID).
+            Conversation ID (UUID unless conversation_id was given).
         """
-        conversation_id = str(uuid.uuid4())
+        if conversation_id is None:
+            conversation_id = str(uuid.uuid4())
         metadata_json = json.dumps(metadata or {})
 
         conn = self._get_connection()
@@ -417,6 +476,26 @@ class DatabaseManager:
             logger.error(f"Failed to get messages: {e}")
             raise
 
+    def get_message_count(self, conversation_id: str) -> int:
+        """Count messages in a conversation without loading them.
+
+        Args:
+            conversation_id: Conversation UUID.
+
+        Returns:
+            Number of stored messages (0 if the conversation has none).
+        """
+        conn = self._get_connection()
+        try:
+            cursor = conn.execute(
+                "SELECT COUNT(*) FROM messages WHERE conversation_id = ?",
+                (conversation_id,),
+            )
+            return cursor.fetchone()[0]
+        except sqlite3.Error as e:
+            logger.error(f"Failed to count messages: {e}")
+            raise
+
     def get_recent_messages(
         self,
         conversation_id: str,
@@ -86,7 +86,7 @@ class MemoryService:
         user_message: str,
         assistant_message: str,
         metadata: Optional[Dict[str, Any]] = None,
-    ):
+    ) -> Optional[Dict[str, Any]]:
         """Save a conversation turn (user message + assistant response).
 
         Args:
@@ -95,6 +95,10 @@ class MemoryService:
             assistant_message: Assistant's response.
             metadata: Optional metadata for the turn.
 
+        Returns:
+            Conversation dict as read after saving, including any
+            auto-generated title, or None if the conversation is not found.
+
         This method:
         1. Saves both messages to database
         2. Auto-generates title if this is the first turn
@@ -121,9 +125,11 @@ class MemoryService:
         if conversation and conversation["message_count"] == 2 and not conversation["title"]:
             title = self._generate_title(user_message)
             self.db.update_conversation_title(conversation_id, title)
+            conversation["title"] = title
             logger.debug(f"Auto-generated title: {title}")
 
         logger.debug(f"Saved turn for conversation {conversation_id}")
+        return conversation
 
     def get_history_for_context(
         self,
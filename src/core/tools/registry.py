@@ -19,6 +19,8 @@ class ToolRegistry:
 
     _tools: Dict[str, Type[BaseTool]] = {}
     _metadata: Dict[str, Dict[str, Any]] = {}
+    # Bumped on every register/clear so schema caches can detect changes
+    _version: int = 0
     _logger = get_logger("tool.registry")
 
     @classmethod
@@ -79,6 +81,7 @@ class ToolRegistry:
             **metadata,
         }
         cls._metadata[tool_name] = tool_metadata
+        cls._version += 1
 
         cls._logger.info(
             f"Registered tool: {tool_name} "
@@ -201,6 +204,17 @@ class ToolRegistry:
                 tools.append(name)
         return tools
 
+    @classmethod
+    def get_version(cls) -> int:
+        """
+        Get the registry version, which changes whenever tools are
+        registered or the registry is cleared.
+
+        Returns:
+            Monotonically increasing registry version
+        """
+        return cls._version
+
     @classmethod
     def get_schemas(cls, tool_names: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
@@ -231,6 +245,7 @@ class ToolRegistry:
         """Clear all registered tools. Useful for testing."""
         cls._tools.clear()
         cls._metadata.clear()
+        cls._version += 1
         cls._logger.debug("Cleared tool registry")
 
 
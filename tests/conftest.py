@@ -1,7 +1,11 @@
 import os
+import uuid
 import pytest
 import tempfile
 from pathlib import Path
+from unittest.mock import Mock
+
+from src.core.client import AIClientWrapper
 
 
 @pytest.fixture
@@ -60,6 +64,44 @@ def temp_config_file(mock_config_yaml):
     os.unlink(temp_path)
 
 
+@pytest.fixture
+def temp_db_path(worker_id):
+    """Fixture providing a unique SQLite database path per test and xdist worker."""
+    path = Path(tempfile.gettempdir()) / f"test_{worker_id}_{uuid.uuid4()}.db"
+
+    yield str(path)
+
+    # Cleanup
+    path.unlink(missing_ok=True)
+
+
+@pytest.fixture(scope="session")
+def session_ai_client():
+    """Fixture providing an AIClientWrapper spec mock, built once per session.
+
+    Per-test fixtures should call ``reset_mock()`` before handing it out so
+    call records do not leak between tests.
+    """
+    client = Mock(spec=AIClientWrapper, current_provider="claude")
+    client.get_default_model.return_value = "claude-sonnet-4-5"
+    return client
+
+
+@pytest.fixture
+def mock_ai_client(monkeypatch, mock_env_vars, session_ai_client):
+    """Fixture patching the AI client and logger used by BaseAgent.
+
+    Returns the session client, fully reset so neither calls nor configured
+    return values/side effects leak between tests.
+    """
+    client = session_ai_client
+    client.reset_mock(return_value=True, side_effect=True)
+    client.get_default_model.return_value = "claude-sonnet-4-5"
+    monkeypatch.setattr("src.core.agent.AIClientWrapper", lambda *a, **k: client)
+    monkeypatch.setattr("src.core.agent.get_logger", lambda *a, **k: Mock())
+    return client
+
+
 @pytest.fixture
 def mock_env_vars(monkeypatch):
     """Fixture to set mock environment variables for API keys."""
@@ -1,7 +1,5 @@
 """Tests for BaseAgent persistence functionality."""
 
-import tempfile
-from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
@@ -19,21 +17,13 @@ class TestAgent(BaseAgent):
 
 
 @pytest.fixture
-def temp_db():
+def temp_db(temp_db_path):
     """Create temporary test database."""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        db_path = f.name
-
-    # Reset singleton for testing
-    DatabaseManager._instance = None
-    DatabaseManager._initialized = False
-
-    db = DatabaseManager(db_path)
+    db = DatabaseManager(temp_db_path, _force_new=True)
     yield db
 
     # Cleanup
     db.close()
-    Path(db_path).unlink(missing_ok=True)
 
 
 @pytest.fixture
@@ -333,5 +323,4 @@ class TestConversationResumption:
         agent2.chat("Message 2")
 
         # Both messages should be persisted
-        messages = memory_service.db.get_messages(conv_id)
-        assert len(messages) == 4  # 2 turns = 4 messages
+        assert memory_service.db.get_message_count(conv_id) == 4  # 2 turns = 4 messages
@@ -3,23 +3,10 @@
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import Mock, patch, MagicMock
-import tempfile
-import os
 
 from src.api.main import app, memory_service
 
 
-@pytest.fixture
-def temp_db_path():
-    """Create a temporary database for testing."""
-    fd, path = tempfile.mkstemp(suffix=".db")
-    os.close(fd)
-    yield path
-    # Cleanup
-    if os.path.exists(path):
-        os.unlink(path)
-
-
 @pytest.fixture
 def client(temp_db_path):
     """Create test client with temporary database."""
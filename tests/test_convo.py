@@ -9,36 +9,59 @@ import src.agents  # noqa: F401
 from src.core import AgentFactory
 from src.agents.convo import ConvoAgent
 
+# Routable-agent metadata shared by the routing tests. Kept at module level so
+# every test hands the strategy the same pattern strings.
+_ROUTABLE = {
+    "hello_agent": {
+        "patterns": [r"^hello"],
+        "keywords": ["hello"],
+        "priority": 0,
+        "enabled": True,
+    }
+}
+
+
+@pytest.fixture(scope="class")
+def patched_agent_deps():
+    """Patch the AI client and logger once for a whole test class."""
+    mock_client_instance = MagicMock()
+    mock_client_instance.current_provider = "claude"
+    mock_client_instance.get_default_model.return_value = "claude-3-5-sonnet-20241022"
+
+    with (
+        patch("src.core.agent.AIClientWrapper", return_value=mock_client_instance),
+        patch("src.core.agent.get_logger"),
+    ):
+        yield mock_client_instance
+
+
+@pytest.fixture(scope="class")
+def convo_router(patched_agent_deps):
+    """Shared ConvoAgent with router enabled. Only use in read-only tests."""
+    return ConvoAgent(provider="claude", use_router=True)
+
+
+@pytest.fixture(scope="class")
+def convo_no_router(patched_agent_deps):
+    """Shared ConvoAgent with router disabled. Only use in read-only tests."""
+    return ConvoAgent(provider="claude", use_router=False)
+
 
 class TestConvoAgent:
     """Tests for ConvoAgent."""
 
-    @patch("src.core.agent.get_logger")
-    @patch("src.core.agent.AIClientWrapper")
-    def test_initialization_with_router(self, mock_client, mock_logger):
+    def test_initialization_with_router(self, convo_router):
         """Test ConvoAgent initialization with router enabled."""
-        mock_client_instance = MagicMock()
-        mock_client_instance.current_provider = "claude"
-        mock_client_instance.get_default_model.return_value = "claude-3-5-sonnet-20241022"
-        mock_client.return_value = mock_client_instance
-
-        agent = ConvoAgent(provider="claude", use_router=True)
+        agent = convo_router
 
         assert agent.name == "ConvoAgent"
         assert agent.use_router is True
         assert agent.router is not None
         assert agent.router_confidence_threshold == 0.7
 
-    @patch("src.core.agent.get_logger")
-    @patch("src.core.agent.AIClientWrapper")
-    def test_initialization_without_router(self, mock_client, mock_logger):
+    def test_initialization_without_router(self, convo_no_router):
         """Test ConvoAgent initialization with router disabled."""
-        mock_client_instance = MagicMock()
-        mock_client_instance.current_provider = "claude"
-        mock_client_instance.get_default_model.return_value = "claude-3-5-sonnet-20241022"
-        mock_client.return_value = mock_client_instance
-
-        agent = ConvoAgent(provider="claude", use_router=False)
+        agent = convo_no_router
 
         assert agent.name == "ConvoAgent"
         assert agent.use_router is False
@@ -67,14 +90,7 @@ class TestConvoAgent:
         mock_client.return_value = mock_client_instance
 
         with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
-            mock_agents.return_value = {
-                "hello_agent": {
-                    "patterns": [r"^hello"],
-                    "keywords": ["hello"],
-                    "priority": 0,
-                    "enabled": True,
-                }
-            }
+            mock_agents.return_value = _ROUTABLE
 
             agent = ConvoAgent(provider="claude", use_router=True)
             result = agent.run("hello world")
@@ -105,14 +121,7 @@ class TestConvoAgent:
 
         with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
             # No matching agents - will fall back to LLM
-            mock_agents.return_value = {
-                "hello_agent": {
-                    "patterns": [r"^hello"],
-                    "keywords": ["hello"],
-                    "priority": 0,
-                    "enabled": True,
-                }
-            }
+            mock_agents.return_value = _ROUTABLE
 
             agent = ConvoAgent(provider="claude", use_router=True)
             result = agent.run("tell me about yourself")
@@ -140,18 +149,9 @@ class TestConvoAgent:
 
         assert result == "Hello! How can I assist you?"
 
-    @patch("src.core.agent.get_logger")
-    @patch("src.core.agent.AIClientWrapper")
-    def test_get_conversation_context(self, mock_client, mock_logger):
+    def test_get_conversation_context(self, convo_router):
         """Test getting conversation context."""
-        mock_client_instance = MagicMock()
-        mock_client_instance.current_provider = "claude"
-        mock_client_instance.get_default_model.return_value = "claude-3-5-sonnet-20241022"
-        mock_client.return_value = mock_client_instance
-
-        agent = ConvoAgent(provider="claude", use_router=True)
-
-        context = agent.get_conversation_context()
+        context = convo_router.get_conversation_context()
 
         assert "history_length" in context
         assert "last_input" in context
@@ -182,15 +182,11 @@ class TestConvoAgent:
         assert len(agent.history) == 0
         assert agent.get_state("test_key") is None
 
-    @patch("src.core.agent.get_logger")
-    @patch("src.core.agent.AIClientWrapper")
-    def test_registered_with_factory(self, mock_client, mock_logger):
+    def test_registered_with_factory(self):
         """Test that ConvoAgent is registered with factory."""
         assert AgentFactory.is_registered("convo")
 
-    @patch("src.core.agent.get_logger")
-    @patch("src.core.agent.AIClientWrapper")
-    def test_disabled_for_routing(self, mock_client, mock_logger):
+    def test_disabled_for_routing(self):
         """Test that ConvoAgent is disabled for routing (enabled=False)."""
         metadata = AgentFactory.get_metadata("convo")
 
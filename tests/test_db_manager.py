@@ -1,9 +1,9 @@
 """Tests for DatabaseManager."""
 
 import json
-import tempfile
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import pytest
@@ -12,21 +12,13 @@ from src.core.db import DatabaseManager
 
 
 @pytest.fixture
-def temp_db():
+def temp_db(temp_db_path):
     """Create temporary test database."""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        db_path = f.name
-
-    # Reset singleton for testing
-    DatabaseManager._instance = None
-    DatabaseManager._initialized = False
-
-    db = DatabaseManager(db_path)
+    db = DatabaseManager(temp_db_path, _force_new=True)
     yield db
 
     # Cleanup
     db.close()
-    Path(db_path).unlink(missing_ok=True)
 
 
 class TestDatabaseInitialization:
@@ -36,10 +28,29 @@ class TestDatabaseInitialization:
         """Test database file is created."""
         assert Path(temp_db.db_path).exists()
 
-    def test_singleton_pattern(self, temp_db):
+    def test_singleton_pattern(self, temp_db_path, monkeypatch):
         """Test singleton pattern returns same instance."""
-        db2 = DatabaseManager.get_instance()
-        assert db2 is temp_db
+        monkeypatch.setattr(DatabaseManager, "_instance", None)
+
+        db = DatabaseManager(temp_db_path)
+        try:
+            assert DatabaseManager.get_instance() is db
+        finally:
+            db.close()
+
+    def test_force_new_bypasses_singleton(self, temp_db_path, monkeypatch):
+        """Test _force_new builds an instance without touching the singleton."""
+        monkeypatch.setattr(DatabaseManager, "_instance", None)
+
+        db = DatabaseManager(temp_db_path, _force_new=True)
+        try:
+            assert DatabaseManager._instance is None
+            shared = DatabaseManager.get_instance(temp_db_path)
+            assert shared is not db
+            assert shared._local is not db._local
+        finally:
+            db.close()
+            DatabaseManager._instance.close()
 
     def test_schema_tables_exist(self, temp_db):
         """Test all required tables exist."""
@@ -84,6 +95,13 @@ class TestConversationOperations:
         assert conv_id is not None
         assert len(conv_id) == 36  # UUID format
 
+    def test_create_conversation_with_explicit_id(self, temp_db):
+        """Test creating a conversation with a caller-supplied ID."""
+        conv_id = temp_db.create_conversation(agent_type="convo", conversation_id="c0001")
+
+        assert conv_id == "c0001"
+        assert temp_db.get_conversation("c0001")["agent_type"] == "convo"
+
     def test_get_conversation(self, temp_db):
         """Test retrieving conversation by ID."""
         conv_id = temp_db.create_conversation(
@@ -113,9 +131,10 @@ class TestConversationOperations:
     def test_list_conversations(self, temp_db):
         """Test listing conversations."""
         # Create multiple conversations
-        conv1 = temp_db.create_conversation(agent_type="convo", title="Conv 1")
-        conv2 = temp_db.create_conversation(agent_type="convo", title="Conv 2")
-        conv3 = temp_db.create_conversation(agent_type="hello_agent", title="Conv 3")
+        for i, agent_type in enumerate(["convo", "convo", "hello_agent"], start=1):
+            temp_db.create_conversation(
+                agent_type=agent_type, title=f"Conv {i}", conversation_id=f"c{i:04d}"
+            )
 
         # List all conversations
         conversations = temp_db.list_conversations()
@@ -129,6 +148,7 @@ class TestConversationOperations:
         limited = temp_db.list_conversations(limit=2)
         assert len(limited) == 2
 
+    @pytest.mark.slow
     def test_list_conversations_ordered_by_recent(self, temp_db):
         """Test conversations are ordered by most recent."""
         conv1 = temp_db.create_conversation(agent_type="convo", title="First")
@@ -169,8 +189,7 @@ class TestConversationOperations:
         temp_db.delete_conversation(conv_id)
 
         # Check messages deleted
-        messages = temp_db.get_messages(conv_id)
-        assert len(messages) == 0
+        assert temp_db.get_message_count(conv_id) == 0
 
         # Check state deleted
         state = temp_db.get_all_state(conv_id)
@@ -233,6 +252,17 @@ class TestMessageOperations:
         assert messages[1]["role"] == "assistant"
         assert messages[2]["role"] == "user"
 
+    def test_get_message_count(self, temp_db):
+        """Test counting messages without loading them."""
+        conv_id = temp_db.create_conversation(agent_type="convo")
+        assert temp_db.get_message_count(conv_id) == 0
+
+        for i in range(3):
+            temp_db.add_message(conv_id, "user", f"Message {i}")
+
+        assert temp_db.get_message_count(conv_id) == 3
+        assert temp_db.get_message_count("missing") == 0
+
     def test_get_messages_with_limit(self, temp_db):
         """Test retrieving messages with limit."""
         conv_id = temp_db.create_conversation(agent_type="convo")
@@ -268,6 +298,7 @@ class TestMessageOperations:
         conv = temp_db.get_conversation(conv_id)
         assert conv["message_count"] == 2
 
+    @pytest.mark.slow
     def test_message_updates_timestamp(self, temp_db):
         """Test adding message updates conversation timestamp."""
         conv_id = temp_db.create_conversation(agent_type="convo")
@@ -364,8 +395,7 @@ class TestTransactions:
             temp_db.add_message(conv_id, "user", "Message 1")
             temp_db.add_message(conv_id, "assistant", "Response 1")
 
-        messages = temp_db.get_messages(conv_id)
-        assert len(messages) == 2
+        assert temp_db.get_message_count(conv_id) == 2
 
     def test_transaction_rollback(self, temp_db):
         """Test transaction rolls back on error."""
@@ -379,49 +409,65 @@ class TestTransactions:
             pass
 
         # Transaction should have rolled back
+        assert temp_db.get_message_count(conv_id) == 0
+
+    def test_nested_transaction_rollback_keeps_outer(self, temp_db):
+        """Test a failing nested transaction only undoes its own writes."""
+        conv_id = temp_db.create_conversation(agent_type="convo")
+
+        with temp_db.transaction():
+            temp_db.add_message(conv_id, "user", "Outer")
+            with pytest.raises(RuntimeError):
+                with temp_db.transaction():
+                    temp_db.add_message(conv_id, "user", "Inner")
+                    raise RuntimeError("Simulated error")
+
         messages = temp_db.get_messages(conv_id)
-        assert len(messages) == 0
+        assert [m["content"] for m in messages] == ["Outer"]
+
+    def test_savepoint_discards_writes(self, temp_db):
+        """Test savepoint rolls back everything written inside it."""
+        kept_id = temp_db.create_conversation(agent_type="convo")
+
+        with temp_db.savepoint():
+            temp_db.add_message(kept_id, "user", "Scratch")
+            scratch_id = temp_db.create_conversation(agent_type="convo")
+            assert temp_db.get_conversation(scratch_id) is not None
+
+        assert temp_db.get_conversation(scratch_id) is None
+        assert temp_db.get_message_count(kept_id) == 0
+        assert temp_db.get_conversation(kept_id) is not None
 
 
 class TestThreadSafety:
     """Test thread safety of database operations."""
 
+    @pytest.mark.slow
     def test_concurrent_message_adds(self, temp_db):
         """Test concurrent message additions are thread-safe."""
-        conv_id = temp_db.create_conversation(agent_type="convo")
+        conv_id = temp_db.create_conversation(agent_type="convo", conversation_id="c0001")
 
         def add_messages(start_idx):
             for i in range(start_idx, start_idx + 10):
                 temp_db.add_message(conv_id, "user", f"Message {i}")
 
-        threads = []
-        for i in range(5):
-            thread = threading.Thread(target=add_messages, args=(i * 10,))
-            threads.append(thread)
-            thread.start()
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            list(executor.map(add_messages, range(0, 50, 10)))
 
-        for thread in threads:
-            thread.join()
-
-        messages = temp_db.get_messages(conv_id)
-        assert len(messages) == 50
+        assert temp_db.get_message_count(conv_id) == 50
 
     def test_thread_local_connections(self, temp_db):
         """Test each thread gets its own connection."""
-        connections = []
+        # Hold every worker at the barrier so the pool can't reuse an idle thread
+        barrier = threading.Barrier(3)
 
-        def get_connection():
+        def get_connection_id(_):
             conn = temp_db._get_connection()
-            connections.append(id(conn))
-
-        threads = []
-        for _ in range(3):
-            thread = threading.Thread(target=get_connection)
-            threads.append(thread)
-            thread.start()
+            barrier.wait()
+            return id(conn)
 
-        for thread in threads:
-            thread.join()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            connections = list(executor.map(get_connection_id, range(3)))
 
         # Each thread should get a different connection
         assert len(set(connections)) == 3
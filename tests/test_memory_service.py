@@ -1,38 +1,62 @@
 """Tests for MemoryService."""
 
-import tempfile
-from pathlib import Path
+import uuid
+from types import SimpleNamespace
 
 import pytest
 
 from src.core.db import DatabaseManager
 from src.core.memory import MemoryService
 
+_UUID_POOL = [uuid.UUID(int=i) for i in range(1000)]
 
-@pytest.fixture
-def temp_db():
-    """Create temporary test database."""
-    with tempfile.NamedTemporaryFile(suffix=".db", delete=False) as f:
-        db_path = f.name
 
-    # Reset singleton for testing
-    DatabaseManager._instance = None
-    DatabaseManager._initialized = False
+@pytest.fixture(autouse=True)
+def deterministic_uuids(monkeypatch):
+    """Hand out conversation IDs from a fixed pool instead of uuid4()."""
+    pool = iter(_UUID_POOL)
+    monkeypatch.setattr(
+        "src.core.db.manager.uuid", SimpleNamespace(uuid4=lambda: next(pool))
+    )
+
 
-    db = DatabaseManager(db_path)
+@pytest.fixture(scope="module")
+def temp_db():
+    """Create in-memory test database shared by the whole module."""
+    db = DatabaseManager(":memory:", _force_new=True)
     yield db
 
     # Cleanup
     db.close()
-    Path(db_path).unlink(missing_ok=True)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def memory_service(temp_db):
-    """Create MemoryService with test database."""
+    """Create MemoryService shared by the whole module."""
     return MemoryService(temp_db)
 
 
+@pytest.fixture(autouse=True)
+def rollback_writes(temp_db):
+    """Roll back everything a test writes to the shared database."""
+    with temp_db.savepoint():
+        yield
+
+
+@pytest.fixture(scope="class")
+def populated_service(temp_db, memory_service):
+    """MemoryService holding five convo and one hello_agent conversation.
+
+    Built once per test class and rolled back afterwards; tests using it
+    must only read.
+    """
+    with temp_db.savepoint():
+        for _ in range(5):
+            memory_service.create_conversation(agent_type="convo")
+        memory_service.create_conversation(agent_type="hello_agent")
+        yield memory_service
+
+
 class TestMemoryServiceCreation:
     """Test MemoryService initialization and conversation creation."""
 
@@ -131,18 +155,32 @@ class TestTurnSaving:
         assert messages[0]["metadata"] == {"source": "cli"}
         assert messages[1]["metadata"] == {"source": "cli"}
 
+    def test_save_turn_returns_persisted_conversation(self, memory_service):
+        """Test save_turn returns the conversation as stored."""
+        conv_id = memory_service.create_conversation(agent_type="convo")
+
+        conversation = memory_service.save_turn(
+            conversation_id=conv_id,
+            user_message="Hello",
+            assistant_message="Hi",
+        )
+
+        stored = memory_service.db.get_conversation(conv_id)
+        assert conversation["id"] == conv_id
+        assert conversation["title"] == stored["title"]
+        assert conversation["message_count"] == stored["message_count"] == 2
+
     def test_auto_title_generation(self, memory_service):
         """Test auto-title generation on first turn."""
         conv_id = memory_service.create_conversation(agent_type="convo")
 
         # First turn should generate title
-        memory_service.save_turn(
+        conversation = memory_service.save_turn(
             conversation_id=conv_id,
             user_message="Tell me about quantum computing",
             assistant_message="Sure, quantum computing is...",
         )
 
-        conversation = memory_service.db.get_conversation(conv_id)
         assert conversation["title"] is not None
         assert "quantum computing" in conversation["title"].lower()
 
@@ -151,40 +189,36 @@ class TestTurnSaving:
         conv_id = memory_service.create_conversation(agent_type="convo")
 
         # First turn
-        memory_service.save_turn(
+        first_title = memory_service.save_turn(
             conversation_id=conv_id,
             user_message="First message",
             assistant_message="Response",
-        )
-
-        conversation = memory_service.db.get_conversation(conv_id)
-        first_title = conversation["title"]
+        )["title"]
 
         # Second turn
-        memory_service.save_turn(
+        conversation = memory_service.save_turn(
             conversation_id=conv_id,
             user_message="Second message",
             assistant_message="Response",
         )
 
-        conversation = memory_service.db.get_conversation(conv_id)
         assert conversation["title"] == first_title  # Should not change
 
-    def test_title_truncation(self, memory_service):
-        """Test long titles are truncated."""
+    @pytest.mark.parametrize(
+        "length,expected", [(49, 49), (50, 50), (51, 50), (200, 50)]
+    )
+    def test_title_truncation(self, memory_service, length, expected):
+        """Test titles longer than 50 characters are truncated."""
         conv_id = memory_service.create_conversation(agent_type="convo")
 
-        long_message = "This is a very long message that exceeds fifty characters and should be truncated by the auto-title generator"
-
-        memory_service.save_turn(
+        conversation = memory_service.save_turn(
             conversation_id=conv_id,
-            user_message=long_message,
+            user_message="x" * length,
             assistant_message="Response",
         )
 
-        conversation = memory_service.db.get_conversation(conv_id)
-        assert len(conversation["title"]) == 50
-        assert conversation["title"].endswith("...")
+        assert len(conversation["title"]) == expected
+        assert conversation["title"].endswith("...") == (length > 50)
 
 
 class TestHistoryRetrieval:
@@ -194,13 +228,14 @@ class TestHistoryRetrieval:
         """Test getting formatted history for LLM context."""
         conv_id = memory_service.create_conversation(agent_type="convo")
 
-        # Add multiple turns
-        for i in range(5):
-            memory_service.save_turn(
-                conversation_id=conv_id,
-                user_message=f"User message {i}",
-                assistant_message=f"Assistant response {i}",
-            )
+        # Add multiple turns in one transaction
+        with memory_service.db.transaction():
+            for i in range(5):
+                memory_service.save_turn(
+                    conversation_id=conv_id,
+                    user_message=f"User message {i}",
+                    assistant_message=f"Assistant response {i}",
+                )
 
         # Get recent history
         history = memory_service.get_history_for_context(conv_id, max_messages=6)
@@ -226,8 +261,9 @@ class TestHistoryRetrieval:
         history = memory_service.get_history_for_context(conv_id)
 
         # Should only have role and content keys
-        assert set(history[0].keys()) == {"role", "content"}
-        assert set(history[1].keys()) == {"role", "content"}
+        assert len(history) == 2
+        for msg in history:
+            assert msg.keys() == {"role", "content"}
 
 
 class TestStateManagement:
@@ -260,33 +296,24 @@ class TestStateManagement:
 class TestConversationListing:
     """Test listing conversations."""
 
-    def test_list_recent_conversations(self, memory_service):
+    def test_list_recent_conversations(self, populated_service):
         """Test listing recent conversations."""
-        # Create multiple conversations
-        conv1 = memory_service.create_conversation(agent_type="convo")
-        conv2 = memory_service.create_conversation(agent_type="convo")
-        conv3 = memory_service.create_conversation(agent_type="hello_agent")
+        conversations = populated_service.list_recent_conversations()
+        assert len(conversations) == 6
 
-        # List all conversations
-        conversations = memory_service.list_recent_conversations()
-        assert len(conversations) >= 3
-
-    def test_list_conversations_by_agent_type(self, memory_service):
+    def test_list_conversations_by_agent_type(self, populated_service):
         """Test filtering conversations by agent type."""
-        conv1 = memory_service.create_conversation(agent_type="convo")
-        conv2 = memory_service.create_conversation(agent_type="hello_agent")
-
         # List only convo conversations
-        convo_conversations = memory_service.list_recent_conversations(agent_type="convo")
-        assert len(convo_conversations) >= 1
+        convo_conversations = populated_service.list_recent_conversations(agent_type="convo")
+        assert len(convo_conversations) == 5
         assert all(c["agent_type"] == "convo" for c in convo_conversations)
 
-    def test_list_conversations_with_limit(self, memory_service):
-        """Test limiting number of conversations returned."""
-        for i in range(5):
-            memory_service.create_conversation(agent_type="convo")
+        hello_conversations = populated_service.list_recent_conversations(agent_type="hello_agent")
+        assert len(hello_conversations) == 1
 
-        conversations = memory_service.list_recent_conversations(limit=3)
+    def test_list_conversations_with_limit(self, populated_service):
+        """Test limiting number of conversations returned."""
+        conversations = populated_service.list_recent_conversations(limit=3)
         assert len(conversations) == 3
 
 
@@ -318,8 +345,7 @@ class TestConversationManagement:
         assert conversation is None
 
         # Verify related data is also gone
-        messages = memory_service.db.get_messages(conv_id)
-        assert len(messages) == 0
+        assert memory_service.db.get_message_count(conv_id) == 0
 
         state = memory_service.load_state(conv_id)
         assert len(state) == 0
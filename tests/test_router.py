@@ -1,10 +1,15 @@
 """Tests for router agent and routing functionality."""
 
+import importlib
+import re
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import FrozenInstanceError
+
 import pytest
 from unittest.mock import patch, MagicMock
 
-# Import agents package to ensure all agents are registered
-import src.agents  # noqa: F401
+from src.agents import ensure_registered
 
 from src.core import AgentFactory
 from src.agents.router import (
@@ -14,7 +19,16 @@ from src.agents.router import (
     RoutingEngine,
     RouteExecutor,
 )
-from src.agents.router.strategies.metadata import MetadataBasedStrategy
+from src.agents.router.strategies.hyperscan import HyperscanStrategy
+from src.agents.router.strategies.metadata import (
+    MetadataBasedStrategy,
+    _PATTERN_CACHE,
+    _RoutingIndex,
+    _compile,
+    _extract_prefix,
+)
+
+ensure_registered()
 
 
 class TestRouteModels:
@@ -34,6 +48,20 @@ class TestRouteModels:
         assert match.metadata["matched_pattern"] == r"hello"
         assert match.strategy_name == "metadata"
 
+    def test_routed_agent_type_is_interned_registry_key(self):
+        """Test routed matches carry the registry's interned agent_type string."""
+        from src.agents import HelloAgent
+
+        built = "".join(["interned", "_agent"])
+        AgentFactory.register(built, HelloAgent, metadata={"patterns": [r"^intern\b"]})
+        try:
+            match = MetadataBasedStrategy().match("intern me", {})
+
+            assert match.agent_type == built
+            assert match.agent_type is sys.intern(built)
+        finally:
+            AgentFactory.unregister(built)
+
     def test_route_result_creation(self):
         """Test RouteResult creation."""
         match = RouteMatch(
@@ -49,6 +77,18 @@ class TestRouteModels:
         assert result.fallback_agent is None
         assert result.error is None
 
+    def test_route_models_are_immutable(self):
+        """Test RouteMatch/RouteResult are frozen, slotted value objects."""
+        match = RouteMatch("hello_agent", 1.0, {}, "metadata")
+        result = RouteResult(matched=True, route_match=match)
+
+        with pytest.raises(FrozenInstanceError):
+            match.confidence = 0.1
+        with pytest.raises(FrozenInstanceError):
+            result.error = "boom"
+        assert not hasattr(match, "__dict__")
+        assert match == RouteMatch("hello_agent", 1.0, {}, "metadata")
+
 
 class TestMetadataBasedStrategy:
     """Tests for metadata-based routing strategy."""
@@ -97,6 +137,20 @@ class TestMetadataBasedStrategy:
             assert match.metadata["match_type"] == "keyword"
             assert "greeting" in match.metadata["matched_keywords"]
 
+    def test_keyword_matching_uses_lowercased_keyword_set(self):
+        """Test keywords are compared case-insensitively as a set."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "hello_agent": {"keywords": ["Greeting", "greeting", "hello"]},
+            }
+
+            match = strategy.match("SEND GREETINGS", {})
+
+            assert match.metadata["matched_keywords"] == ["greeting"]
+            assert match.confidence == pytest.approx(0.4)
+
     def test_no_match(self):
         """Test when no agent matches."""
         strategy = MetadataBasedStrategy()
@@ -142,6 +196,422 @@ class TestMetadataBasedStrategy:
 
             assert match.agent_type == "high_priority"
 
+    def test_priority_beats_position_in_input(self):
+        """Test a higher-priority pattern wins even if it matches later in the input."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "low_priority": {"patterns": [r"hello"], "priority": 0},
+                "high_priority": {"patterns": [r"world", r"^hello"], "priority": 5},
+            }
+
+            match = strategy.match("hello world", {})
+
+            # First declared pattern of the winning agent is reported
+            assert match.agent_type == "high_priority"
+            assert match.metadata["matched_pattern"] == r"world"
+
+    def test_backreference_pattern(self):
+        """Test patterns with backreferences are matched as written."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "double_letter": {"patterns": [r"(\w)\1"], "priority": 0},
+            }
+
+            match = strategy.match("book", {})
+
+            assert match.agent_type == "double_letter"
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [("<abc>", "tag"), ("abc", "tag"), ("<abc", None)],
+    )
+    def test_conditional_group_pattern(self, text, expected):
+        """Test conditional group references match as they do with re.search."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "tag": {"patterns": [r"^(<)?\w+(?(1)>)$"], "priority": 0},
+            }
+
+            match = strategy.match(text, {})
+
+            assert match.agent_type == expected
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [("Hello there", "greeter"), ("hello there", None)],
+    )
+    def test_case_sensitive_compiled_pattern_keeps_case(self, text, expected):
+        """Test precompiled case-sensitive anchored literals aren't fused into
+        the case-insensitive anchored regex."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "greeter": {"patterns": [re.compile(r"^Hello")], "priority": 0}
+            }
+
+            match = strategy.match(text, {})
+
+            assert strategy._index.anchored is None
+            assert match.agent_type == expected
+
+    def test_multiline_compiled_pattern_not_fused(self):
+        """Test MULTILINE anchored literals keep matching after a newline."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "greeter": {
+                    "patterns": [re.compile(r"^hello", re.IGNORECASE | re.MULTILINE)]
+                }
+            }
+
+            match = strategy.match("well\nhello", {})
+
+            assert strategy._index.anchored is None
+            assert match.agent_type == "greeter"
+
+    @pytest.mark.parametrize(
+        "pattern, expected",
+        [
+            (r"^hello\b", ("hello", True)),
+            (r"^Say\ hi", ("say hi", False)),
+            (r"^a\.b", ("a.b", False)),
+            (r"hello", None),
+            (r"^hello|world", None),
+            (r"^h.llo", None),
+            (r"^hi\s", None),
+        ],
+    )
+    def test_extract_prefix(self, pattern, expected):
+        """Test only anchored literal patterns yield a prefix."""
+        assert _extract_prefix(pattern) == expected
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("Hello there", "prefix"),
+            ("hello", "prefix"),
+            ("helloworld", "double_letter"),
+            ("say hello", "double_letter"),
+            ("nothing", None),
+        ],
+    )
+    def test_anchored_literals_fused(self, text, expected):
+        """Test fused anchored literals honour case and word boundaries and
+        keep their place in priority order."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "prefix": {"patterns": [r"^hello\b"], "priority": 5},
+                "double_letter": {"patterns": [r"(\w)\1"], "priority": 0},
+            }
+
+            match = strategy.match(text, {})
+
+            assert strategy._index.anchored is not None
+            assert match.agent_type == expected
+
+    @pytest.mark.parametrize(
+        "text, expected",
+        [
+            ("hello world", "world"),
+            ("hello there", "hello"),
+            ("hi bar", "hi"),
+            ("bar", "bar"),
+        ],
+    )
+    def test_unanchored_patterns_ordered_around_anchored_hit(self, text, expected):
+        """Test unanchored patterns ahead of the first anchored hit win, and
+        later ones lose to it."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "world": {"patterns": [r"wor+ld"], "priority": 3},
+                "hello": {"patterns": [r"^hello\b"], "priority": 2},
+                "hi": {"patterns": [r"^hi\b"], "priority": 1},
+                "bar": {"patterns": [r"ba?r"], "priority": 0},
+            }
+
+            assert strategy.match(text, {}).agent_type == expected
+
+    def test_index_cached_until_registry_changes(self):
+        """Test the routing index is reused until the registry version changes."""
+        strategy = MetadataBasedStrategy()
+
+        strategy.match("hello", {})
+        index = strategy._index
+        strategy.match("hi", {})
+        assert strategy._index is index
+
+        with patch.object(AgentFactory, "_version", AgentFactory.get_version() + 1):
+            strategy.match("hello", {})
+        assert strategy._index is not index
+
+    def test_get_index_returns_the_index_it_built(self):
+        """Test _get_index returns its own index even if another thread
+        replaces the cached one meanwhile."""
+        strategy = MetadataBasedStrategy()
+        agents = {"greeter": {"patterns": [r"^hello\b"]}}
+        other = ({}, -1, _RoutingIndex([], {}))
+        get_patterns = strategy._get_patterns
+
+        def get_patterns_and_race(agent_type, metadata):
+            strategy._index_entry = other
+            return get_patterns(agent_type, metadata)
+
+        with patch.object(strategy, "_get_patterns", side_effect=get_patterns_and_race):
+            index = strategy._get_index(agents)
+
+        assert index is not other[2]
+        assert [agent_type for agent_type, _, _ in index.targets] == ["greeter"]
+        assert strategy._index_entry[2] is index
+
+    def test_patterns_with_own_groups_resolve_to_their_agent(self):
+        """Test capturing groups inside patterns don't affect which agent wins."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "first": {"patterns": [r"(foo)(bar)"], "priority": 1},
+                "second": {"patterns": [r"(?P<verb>run|walk) (\w+)"], "priority": 0},
+            }
+
+            assert strategy.match("please run fast", {}).agent_type == "second"
+            assert strategy.match("a foobar b", {}).agent_type == "first"
+
+    def test_keyword_phase_limited_to_agents_with_keywords(self):
+        """Test agents without keywords are left out of the keyword phase."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "pattern_only": {"patterns": [r"^hello"], "priority": 5},
+                "keyword_only": {"keywords": ["world"], "priority": 0},
+            }
+
+            match = strategy.match("big world", {})
+
+            assert match.agent_type == "keyword_only"
+            assert [entry[0] for entry in strategy._index.keyword_agents] == ["keyword_only"]
+
+    def test_no_keyword_agents_skips_keyword_scan(self):
+        """Test keywords aren't searched for when no agent has any."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {"pattern_only": {"patterns": [r"^hello"]}}
+
+            with patch.object(_RoutingIndex, "find_keywords", side_effect=AssertionError):
+                match = strategy.match("unrelated", {})
+
+            assert match.agent_type is None
+
+    def test_find_keywords_pools_agents_keywords(self):
+        """Test keywords from all agents are found as substrings of the input."""
+        index = _RoutingIndex(
+            [("a", {"keywords": ["Hi", "greet"]}), ("b", {"keywords": ["hi", "bye"]})],
+            {"a": [], "b": []},
+        )
+
+        assert index.keywords == {"hi", "greet", "bye"}
+        assert index.find_keywords("this greeting") == {"hi", "greet"}
+        assert index.find_keywords("xyz") == set()
+
+    def test_threshold_above_keyword_scores_skips_keywords(self):
+        """Test only patterns are tried when keywords can't reach the threshold."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "hello_agent": {"patterns": [r"^hello"], "keywords": ["greeting"]},
+            }
+
+            with patch.object(_RoutingIndex, "find_keywords", side_effect=AssertionError):
+                keyword_only = strategy.match("a greeting", {}, confidence_threshold=0.9)
+                pattern = strategy.match("hello", {}, confidence_threshold=0.9)
+
+            assert keyword_only.agent_type is None
+            assert pattern.agent_type == "hello_agent"
+            assert strategy.match("a greeting", {}, confidence_threshold=0.8).confidence == 0.8
+
+    def test_no_keyword_hits_skips_scoring(self):
+        """Test agents aren't scored when no keyword occurs in the input."""
+
+        class _NoIteration(list):
+            def __iter__(self):
+                raise AssertionError("keyword agents iterated")
+
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {"hello_agent": {"keywords": ["hello"]}}
+            strategy.match("warm up", {})
+            strategy._index.keyword_agents = _NoIteration(strategy._index.keyword_agents)
+
+            match = strategy.match("unrelated input", {})
+
+            assert match.agent_type is None
+            assert match.confidence == 0.0
+
+    def test_unregistered_patterns_compiled_once(self):
+        """Test pattern strings are compiled once and shared across rebuilds."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.side_effect = lambda: {"greeter": {"patterns": [r"greet\w*"]}}
+
+            strategy.match("greetings", {})
+            first = strategy._index.targets[0][1]
+            strategy.match("greetings", {})
+
+            assert strategy._index.targets[0][1] is first
+            assert first is _compile(r"greet\w*")
+            assert first.flags & re.IGNORECASE
+
+    def test_anchored_regex_not_kept_in_pattern_cache(self):
+        """Test rebuilding the index doesn't accumulate fused regexes."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.side_effect = lambda: {"greeter": {"patterns": [r"^greet\b"]}}
+            strategy.match("greetings", {})
+
+        assert strategy._index.anchored is not None
+        assert strategy._index.anchored.pattern not in _PATTERN_CACHE
+
+    def test_invalid_pattern_skipped(self):
+        """Test that an invalid regex is skipped rather than raising."""
+        strategy = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "hello_agent": {
+                    "patterns": [r"(", r"^hello"],
+                    "keywords": [],
+                    "priority": 0,
+                    "enabled": True,
+                }
+            }
+
+            match = strategy.match("Hello there", {})
+
+            assert match.agent_type == "hello_agent"
+            assert match.metadata["matched_pattern"] == r"^hello"
+
+    def test_registered_metadata_uses_compiled_patterns(self):
+        """Test registered agents are matched with their precompiled patterns."""
+        strategy = MetadataBasedStrategy()
+        metadata = AgentFactory.get_metadata("hello_agent")
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {"hello_agent": metadata}
+
+            with patch.object(
+                strategy, "_coerce_patterns", side_effect=AssertionError
+            ):
+                match = strategy.match("HEY you", {})
+
+            assert match.agent_type == "hello_agent"
+            assert match.metadata["matched_pattern"] == r"^hey\b"
+
+
+class TestHyperscanStrategy:
+    """Tests for the optional Hyperscan-backed strategy."""
+
+    def test_engine_uses_re_backend_by_default(self):
+        """Test the engine only uses Hyperscan when asked to, even if installed."""
+        engine = RoutingEngine()
+
+        assert "hyperscan" not in engine.strategies
+        assert engine.route("hello", {}).route_match.strategy_name == "metadata"
+
+    def test_engine_rejects_unknown_backend(self):
+        """Test an unknown pattern backend is reported."""
+        with pytest.raises(ValueError, match="Unknown pattern backend"):
+            RoutingEngine(pattern_backend="pcre")
+
+    def test_engine_hyperscan_backend_requires_package(self):
+        """Test opting into Hyperscan without the package fails clearly."""
+        with patch("src.agents.router.strategies.hyperscan.hyperscan", None):
+            with pytest.raises(ImportError, match="hyperscan"):
+                RoutingEngine(pattern_backend="hyperscan")
+
+    def test_engine_hyperscan_backend(self):
+        """Test the engine routes through Hyperscan when opted in."""
+        pytest.importorskip("hyperscan")
+        engine = RoutingEngine(pattern_backend="hyperscan")
+
+        assert engine.route("hello", {}).route_match.strategy_name == "hyperscan"
+
+    def test_requires_hyperscan(self):
+        """Test constructing the strategy without hyperscan fails clearly."""
+        with patch("src.agents.router.strategies.hyperscan.hyperscan", None):
+            with pytest.raises(ImportError, match="hyperscan"):
+                HyperscanStrategy()
+
+    def test_matches_like_metadata_strategy(self):
+        """Test priority order and keyword fallback agree with the re-based strategy."""
+        pytest.importorskip("hyperscan")
+        strategy = HyperscanStrategy()
+        reference = MetadataBasedStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "low_priority": {"patterns": [r"hello"], "priority": 0},
+                "high_priority": {"patterns": [r"world", r"^hello\b"], "priority": 5},
+                "keyword_only": {"keywords": ["greeting"], "priority": 0},
+            }
+
+            for text in ["hello world", "HELLO there", "say hello", "a greeting", "nothing"]:
+                match = strategy.match(text, {})
+                expected = reference.match(text, {})
+
+                assert match.agent_type == expected.agent_type
+                assert match.metadata == expected.metadata
+                assert match.strategy_name == "hyperscan"
+
+    def test_unsupported_pattern_falls_back_to_re(self):
+        """Test patterns Hyperscan can't compile are still matched."""
+        pytest.importorskip("hyperscan")
+        strategy = HyperscanStrategy()
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {
+                "double_letter": {"patterns": [r"(\w)\1"], "priority": 0},
+            }
+
+            match = strategy.match("book", {})
+
+            assert match.agent_type == "double_letter"
+            assert strategy._database_entry[1] is None
+
+    def test_database_cached_with_its_index(self):
+        """Test the database is returned and cached together with its index,
+        even if another thread swaps the cache during compilation."""
+        with patch("src.agents.router.strategies.hyperscan.hyperscan", MagicMock()):
+            strategy = HyperscanStrategy()
+        index, other_index = object(), object()
+
+        def compile_and_race(compiled_index):
+            strategy._database_entry = (other_index, "other database")
+            return f"database for {id(compiled_index)}"
+
+        with patch.object(strategy, "_compile", side_effect=compile_and_race):
+            database = strategy._get_database(index)
+
+        assert database == f"database for {id(index)}"
+        assert strategy._database_entry == (index, database)
+        assert strategy._get_database(index) is database
+
 
 class TestRoutingEngine:
     """Tests for routing engine."""
@@ -194,6 +664,36 @@ class TestRoutingEngine:
             assert result.fallback_agent == "hello_agent"
             assert result.route_match.agent_type == "hello_agent"
 
+    def test_engine_passes_threshold_to_strategy(self):
+        """Test the engine's threshold reaches the strategy."""
+        engine = RoutingEngine(confidence_threshold=0.9)
+        strategy = engine.strategies["metadata"]
+
+        with patch.object(strategy, "match", wraps=strategy.match) as mock_match:
+            engine.route("hello", {})
+
+        assert mock_match.call_args.kwargs["confidence_threshold"] == 0.9
+
+    def test_fallback_result_reused_until_default_changes(self):
+        """Test misses share one fallback result, rebuilt if default_agent changes."""
+        engine = RoutingEngine(default_agent="hello_agent")
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {"hello_agent": {"patterns": [r"^hello"]}}
+
+            first = engine.route("unrelated input", {})
+            assert engine.route("something else", {}) is first
+            assert first.route_match.metadata == {"fallback": True, "reason": "no_match"}
+            with pytest.raises(TypeError):
+                first.route_match.metadata["reason"] = "changed"
+
+            engine.default_agent = "convo"
+            result = engine.route("unrelated input", {})
+
+            assert result is not first
+            assert result.fallback_agent == "convo"
+            assert result.route_match.agent_type == "convo"
+
     def test_add_strategy(self):
         """Test adding a new routing strategy."""
         engine = RoutingEngine()
@@ -326,13 +826,33 @@ class TestRouterAgent:
 
     @patch("src.core.agent.get_logger")
     @patch("src.core.agent.AIClientWrapper")
-    def test_router_registered_with_factory(self, mock_client, mock_logger):
+    def test_router_fallback_state_is_a_copy(self, mock_client, mock_logger):
+        """Test routing info in state doesn't alias the shared fallback metadata."""
+        mock_client_instance = MagicMock()
+        mock_client_instance.current_provider = "claude"
+        mock_client_instance.get_default_model.return_value = (
+            "claude-3-5-sonnet-20241022"
+        )
+        mock_client.return_value = mock_client_instance
+
+        with patch.object(AgentFactory, "get_routable_agents") as mock_agents:
+            mock_agents.return_value = {"hello_agent": {"patterns": [r"^hello"]}}
+
+            router = RouterAgent(provider="claude")
+            router.run("unrelated input")
+
+            stored = router.get_state("last_route")["metadata"]
+            assert type(stored) is dict
+            stored["reason"] = "changed"
+
+            result = router.engine.route("something else", {})
+            assert result.route_match.metadata["reason"] == "no_match"
+
+    def test_router_registered_with_factory(self):
         """Test that RouterAgent is registered with factory."""
         assert AgentFactory.is_registered("router")
 
-    @patch("src.core.agent.get_logger")
-    @patch("src.core.agent.AIClientWrapper")
-    def test_router_disabled_for_routing(self, mock_client, mock_logger):
+    def test_router_disabled_for_routing(self):
         """Test that RouterAgent is disabled for routing (enabled=False)."""
         metadata = AgentFactory.get_metadata("router")
 
@@ -367,3 +887,140 @@ class TestAgentFactoryMetadata:
 
         # router should NOT be routable (enabled=False)
         assert "router" not in routable
+
+    def test_get_routable_agents_cached_per_version(self):
+        """Test routable agents are cached until the registry changes."""
+        from src.agents import HelloAgent
+
+        routable = AgentFactory.get_routable_agents()
+        assert AgentFactory.get_routable_agents() is routable
+
+        with pytest.raises(TypeError):
+            routable["new_agent"] = {}
+
+        AgentFactory.register("temp_routable", HelloAgent, metadata={})
+        try:
+            updated = AgentFactory.get_routable_agents()
+            assert updated is not routable
+            assert "temp_routable" in updated
+        finally:
+            AgentFactory.unregister("temp_routable")
+
+        assert "temp_routable" not in AgentFactory.get_routable_agents()
+
+    def test_get_routable_agents_sorted(self):
+        """Test routable agents are presorted by priority and cached."""
+        from src.agents import HelloAgent
+
+        AgentFactory.register("temp_low", HelloAgent, metadata={"priority": -1})
+        AgentFactory.register("temp_high", HelloAgent, metadata={"priority": 99})
+        try:
+            ordered = AgentFactory.get_routable_agents_sorted()
+            agent_types = [agent_type for agent_type, _ in ordered]
+
+            assert agent_types[0] == "temp_high"
+            assert agent_types[-1] == "temp_low"
+            assert "router" not in agent_types
+            assert AgentFactory.get_routable_agents_sorted() is ordered
+        finally:
+            AgentFactory.unregister("temp_low")
+            AgentFactory.unregister("temp_high")
+
+    def test_compiled_patterns_built_at_registration(self):
+        """Test patterns are compiled once while metadata keeps the strings."""
+        metadata = AgentFactory.get_metadata("hello_agent")
+        compiled = AgentFactory.get_compiled_patterns("hello_agent")
+
+        assert [p.pattern for p in compiled] == metadata["patterns"]
+        assert all(isinstance(p, str) for p in metadata["patterns"])
+        assert all(p.flags & re.IGNORECASE for p in compiled)
+        assert AgentFactory.get_compiled_patterns("unknown_agent") == []
+
+    def test_register_lazy_imports_on_first_lookup(self, tmp_path, monkeypatch):
+        """Test lazily declared agents are imported only when looked up."""
+        (tmp_path / "lazy_sample_agent.py").write_text(
+            "from src.agents.hello_agent import HelloAgent\n"
+            "from src.core import register_agent\n"
+            "\n"
+            "@register_agent('lazy_sample', keywords=['lazy'])\n"
+            "class LazySampleAgent(HelloAgent):\n"
+            "    pass\n"
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "lazy_sample_agent", raising=False)
+
+        AgentFactory.register_lazy({"lazy_sample": "lazy_sample_agent:LazySampleAgent"})
+        try:
+            assert "lazy_sample_agent" not in sys.modules
+
+            assert AgentFactory.get_metadata("lazy_sample")["keywords"] == ["lazy"]
+            assert "lazy_sample_agent" in sys.modules
+            assert AgentFactory.is_registered("lazy_sample")
+        finally:
+            AgentFactory.unregister("lazy_sample")
+
+    def test_register_lazy_failed_import_is_retried(self, tmp_path, monkeypatch):
+        """Test an agent whose import fails stays declared for the next lookup."""
+        module_path = tmp_path / "lazy_broken_agent.py"
+        module_path.write_text("raise ImportError('missing SDK')\n")
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "lazy_broken_agent", raising=False)
+
+        AgentFactory.register_lazy({"lazy_broken": "lazy_broken_agent:LazyBrokenAgent"})
+        try:
+            for _ in range(2):
+                with pytest.raises(ImportError, match="missing SDK"):
+                    AgentFactory.is_registered("lazy_broken")
+
+            module_path.write_text(
+                "from src.agents.hello_agent import HelloAgent\n"
+                "from src.core import register_agent\n"
+                "\n"
+                "@register_agent('lazy_broken')\n"
+                "class LazyBrokenAgent(HelloAgent):\n"
+                "    pass\n"
+            )
+            importlib.invalidate_caches()
+
+            assert AgentFactory.is_registered("lazy_broken")
+        finally:
+            AgentFactory.unregister("lazy_broken")
+
+    def test_register_lazy_concurrent_lookups_wait_for_import(self, tmp_path, monkeypatch):
+        """Test lookups racing a lazy import see the agent once it registers."""
+        (tmp_path / "lazy_slow_agent.py").write_text(
+            "import time\n"
+            "from src.agents.hello_agent import HelloAgent\n"
+            "from src.core import register_agent\n"
+            "\n"
+            "time.sleep(0.1)\n"
+            "\n"
+            "@register_agent('lazy_slow')\n"
+            "class LazySlowAgent(HelloAgent):\n"
+            "    pass\n"
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        monkeypatch.delitem(sys.modules, "lazy_slow_agent", raising=False)
+
+        AgentFactory.register_lazy({"lazy_slow": "lazy_slow_agent:LazySlowAgent"})
+        try:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                results = list(
+                    pool.map(lambda _: AgentFactory.is_registered("lazy_slow"), range(4))
+                )
+
+            assert results == [True] * 4
+        finally:
+            AgentFactory.unregister("lazy_slow")
+
+    def test_create_unknown_agent_lists_lazy_agents(self, monkeypatch):
+        """Test the error for an unknown type includes not-yet-imported agents."""
+        monkeypatch.setitem(AgentFactory._lazy_agents, "pending_agent", "no_such_module:Agent")
+
+        with pytest.raises(ValueError, match="pending_agent"):
+            AgentFactory.create("no_such_agent")
+
+    def test_ensure_registered_rejects_unknown_agent(self):
+        """Test ensure_registered only accepts agents from the manifest."""
+        with pytest.raises(ValueError, match="Unknown agent type"):
+            ensure_registered("no_such_agent")
@@ -1,10 +1,14 @@
 """Integration tests for tool system with agents."""
 
 import json
-from unittest.mock import Mock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import patch
 import pytest
 
+# Register built-in tools once for the module
+import src.tools  # noqa: F401
 from src.core import BaseAgent, AgentFactory
+from src.core import agent as agent_module
 from src.core.tools import ToolRegistry, ToolExecutor, ToolResult
 
 
@@ -16,22 +20,29 @@ class TestAgent(BaseAgent):
         return f"Test: {input_data}"
 
 
+def _stub_response(content, tool_calls=None):
+    """Chat completion response with a single choice."""
+    message = SimpleNamespace(content=content, tool_calls=tool_calls)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+def _stub_tool_call(call_id, name, arguments):
+    """Tool call as requested by the LLM."""
+    return SimpleNamespace(
+        id=call_id, function=SimpleNamespace(name=name, arguments=arguments)
+    )
+
+
+def _stub_completed_process(stdout, returncode=0, stderr=""):
+    """Result of subprocess.run."""
+    return SimpleNamespace(returncode=returncode, stdout=stdout, stderr=stderr)
+
+
 class TestToolIntegration:
     """Test integration between tools and agents."""
 
-    @patch("src.core.agent.get_logger")
-    @patch("src.core.agent.AIClientWrapper")
-    def test_agent_with_tools_enabled(self, mock_client_class, mock_get_logger, mock_env_vars):
+    def test_agent_with_tools_enabled(self, mock_ai_client):
         """Test that agent can be initialized with tools enabled."""
-        # Setup mocks
-        mock_client = Mock()
-        mock_client.current_provider = "claude"
-        mock_client.get_default_model.return_value = "claude-sonnet-4-5"
-        mock_client_class.return_value = mock_client
-
-        # Import tools to register them
-        import src.tools  # noqa: F401
-
         # Create agent with tools
         agent = TestAgent(
             name="test_agent",
@@ -44,16 +55,8 @@ class TestToolIntegration:
         assert agent.tool_executor is not None
         assert isinstance(agent.tool_executor, ToolExecutor)
 
-    @patch("src.core.agent.get_logger")
-    @patch("src.core.agent.AIClientWrapper")
-    def test_agent_without_tools(self, mock_client_class, mock_get_logger, mock_env_vars):
+    def test_agent_without_tools(self, mock_ai_client):
         """Test that agent works without tools."""
-        # Setup mocks
-        mock_client = Mock()
-        mock_client.current_provider = "claude"
-        mock_client.get_default_model.return_value = "claude-sonnet-4-5"
-        mock_client_class.return_value = mock_client
-
         # Create agent without tools
         agent = TestAgent(
             name="test_agent",
@@ -64,28 +67,10 @@ class TestToolIntegration:
         assert agent.available_tools == []
         assert agent.tool_executor is None
 
-    @patch("src.core.agent.get_logger")
-    @patch("src.core.agent.AIClientWrapper")
     @patch("subprocess.run")
-    def test_use_tool_manual_execution(
-        self, mock_subprocess, mock_client_class, mock_get_logger, mock_env_vars
-    ):
+    def test_use_tool_manual_execution(self, mock_subprocess, mock_ai_client):
         """Test manually executing a tool via use_tool method."""
-        # Setup mocks
-        mock_client = Mock()
-        mock_client.current_provider = "claude"
-        mock_client.get_default_model.return_value = "claude-sonnet-4-5"
-        mock_client_class.return_value = mock_client
-
-        # Mock subprocess for bash tool
-        mock_result = Mock()
-        mock_result.returncode = 0
-        mock_result.stdout = "test output"
-        mock_result.stderr = ""
-        mock_subprocess.return_value = mock_result
-
-        # Import tools
-        import src.tools  # noqa: F401
+        mock_subprocess.return_value = _stub_completed_process("test output")
 
         # Create agent with tools
         agent = TestAgent(
@@ -102,16 +87,28 @@ class TestToolIntegration:
         assert result.output["stdout"] == "test output"
         assert len(agent.tool_history) == 1
 
-    @patch("src.core.agent.get_logger")
-    @patch("src.core.agent.AIClientWrapper")
-    def test_use_tool_raises_when_disabled(self, mock_client_class, mock_get_logger, mock_env_vars):
-        """Test that use_tool raises error when tools are disabled."""
-        # Setup mocks
-        mock_client = Mock()
-        mock_client.current_provider = "claude"
-        mock_client.get_default_model.return_value = "claude-sonnet-4-5"
-        mock_client_class.return_value = mock_client
+    @patch("subprocess.run")
+    def test_tool_history_is_bounded(self, mock_subprocess, mock_ai_client):
+        """Test tool_history keeps only the most recent executions."""
+        mock_subprocess.return_value = _stub_completed_process("output")
 
+        agent = TestAgent(
+            name="test_agent",
+            enable_tools=True,
+            tools=["bash"],
+            tool_history_maxlen=2,
+        )
+
+        for i in range(3):
+            agent.use_tool("bash", command=f"echo {i}")
+
+        assert [entry["params"]["command"] for entry in agent.tool_history] == [
+            "echo 1",
+            "echo 2",
+        ]
+
+    def test_use_tool_raises_when_disabled(self, mock_ai_client):
+        """Test that use_tool raises error when tools are disabled."""
         # Create agent without tools
         agent = TestAgent(
             name="test_agent",
@@ -122,26 +119,9 @@ class TestToolIntegration:
         with pytest.raises(RuntimeError, match="Tools not enabled"):
             agent.use_tool("bash", command="echo hello")
 
-    @patch("src.core.agent.get_logger")
-    @patch("src.core.agent.AIClientWrapper")
-    def test_chat_with_tools_fallback_to_regular_chat(
-        self, mock_client_class, mock_get_logger, mock_env_vars
-    ):
+    def test_chat_with_tools_fallback_to_regular_chat(self, mock_ai_client):
         """Test that chat_with_tools falls back to regular chat when tools disabled."""
-        # Setup mocks
-        mock_client = Mock()
-        mock_client.current_provider = "claude"
-        mock_client.get_default_model.return_value = "claude-sonnet-4-5"
-
-        # Mock chat_completion
-        mock_response = Mock()
-        mock_message = Mock()
-        mock_message.content = "Hello!"
-        mock_message.tool_calls = None
-        mock_response.choices = [Mock(message=mock_message)]
-        mock_client.chat_completion.return_value = mock_response
-
-        mock_client_class.return_value = mock_client
+        mock_ai_client.chat_completion.return_value = _stub_response("Hello!")
 
         # Create agent without tools
         agent = TestAgent(
@@ -153,62 +133,25 @@ class TestToolIntegration:
         response = agent.chat_with_tools("hello")
 
         # Should have called chat_completion once (regular chat)
-        assert mock_client.chat_completion.call_count == 1
+        assert mock_ai_client.chat_completion.call_count == 1
         # Verify no tools were passed
-        call_kwargs = mock_client.chat_completion.call_args[1]
+        call_kwargs = mock_ai_client.chat_completion.call_args[1]
         assert "tools" not in call_kwargs or call_kwargs.get("tools") is None
 
-    @patch("src.core.agent.get_logger")
-    @patch("src.core.agent.AIClientWrapper")
     @patch("subprocess.run")
-    def test_chat_with_tools_executes_tool_calls(
-        self, mock_subprocess, mock_client_class, mock_get_logger, mock_env_vars
-    ):
+    def test_chat_with_tools_executes_tool_calls(self, mock_subprocess, mock_ai_client):
         """Test that chat_with_tools executes tool calls requested by LLM."""
-        # Setup mocks
-        mock_client = Mock()
-        mock_client.current_provider = "claude"
-        mock_client.get_default_model.return_value = "claude-sonnet-4-5"
-
-        # Mock subprocess for bash tool
-        mock_cmd_result = Mock()
-        mock_cmd_result.returncode = 0
-        mock_cmd_result.stdout = "Hello World"
-        mock_cmd_result.stderr = ""
-        mock_subprocess.return_value = mock_cmd_result
-
-        # First response: LLM requests tool call
-        mock_tool_call = MagicMock()
-        mock_tool_call.id = "call_123"
-        mock_tool_call.function.name = "bash"
-        mock_tool_call.function.arguments = '{"command": "echo Hello"}'
-
-        mock_first_message = Mock()
-        mock_first_message.content = "I'll execute that command"
-        mock_first_message.tool_calls = [mock_tool_call]
-
-        mock_first_response = Mock()
-        mock_first_response.choices = [Mock(message=mock_first_message)]
-
-        # Second response: LLM provides final answer
-        mock_second_message = Mock()
-        mock_second_message.content = "The command output: Hello World"
-        mock_second_message.tool_calls = None
-
-        mock_second_response = Mock()
-        mock_second_response.choices = [Mock(message=mock_second_message)]
-
-        # Configure mock to return different responses on successive calls
-        mock_client.chat_completion.side_effect = [
-            mock_first_response,
-            mock_second_response,
+        mock_subprocess.return_value = _stub_completed_process("Hello World")
+
+        # First response requests a tool call, second gives the final answer
+        mock_ai_client.chat_completion.side_effect = [
+            _stub_response(
+                "I'll execute that command",
+                tool_calls=[_stub_tool_call("call_123", "bash", '{"command": "echo Hello"}')],
+            ),
+            _stub_response("The command output: Hello World"),
         ]
 
-        mock_client_class.return_value = mock_client
-
-        # Import tools
-        import src.tools  # noqa: F401
-
         # Create agent with tools
         agent = TestAgent(
             name="test_agent",
@@ -220,10 +163,10 @@ class TestToolIntegration:
         response = agent.chat_with_tools("run echo Hello")
 
         # Should have called chat_completion twice
-        assert mock_client.chat_completion.call_count == 2
+        assert mock_ai_client.chat_completion.call_count == 2
 
         # First call should include tools
-        first_call_kwargs = mock_client.chat_completion.call_args_list[0][1]
+        first_call_kwargs = mock_ai_client.chat_completion.call_args_list[0][1]
         assert "tools" in first_call_kwargs
         assert first_call_kwargs["tool_choice"] == "auto"
 
@@ -234,37 +177,13 @@ class TestToolIntegration:
         # Final response should be from LLM
         assert response.choices[0].message.content == "The command output: Hello World"
 
-    @patch("src.core.agent.get_logger")
-    @patch("src.core.agent.AIClientWrapper")
-    def test_chat_with_tools_max_iterations(
-        self, mock_client_class, mock_get_logger, mock_env_vars
-    ):
+    def test_chat_with_tools_max_iterations(self, mock_ai_client):
         """Test that chat_with_tools respects max iterations limit."""
-        # Setup mocks
-        mock_client = Mock()
-        mock_client.current_provider = "claude"
-        mock_client.get_default_model.return_value = "claude-sonnet-4-5"
-
-        # Mock tool call that never stops
-        mock_tool_call = MagicMock()
-        mock_tool_call.id = "call_123"
-        mock_tool_call.function.name = "bash"
-        mock_tool_call.function.arguments = '{"command": "echo loop"}'
-
-        mock_message = Mock()
-        mock_message.content = "Looping..."
-        mock_message.tool_calls = [mock_tool_call]
-
-        mock_response = Mock()
-        mock_response.choices = [Mock(message=mock_message)]
-
         # Always return tool call request
-        mock_client.chat_completion.return_value = mock_response
-
-        mock_client_class.return_value = mock_client
-
-        # Import tools
-        import src.tools  # noqa: F401
+        mock_ai_client.chat_completion.return_value = _stub_response(
+            "Looping...",
+            tool_calls=[_stub_tool_call("call_123", "bash", '{"command": "echo loop"}')],
+        )
 
         # Create agent with tools
         agent = TestAgent(
@@ -275,14 +194,75 @@ class TestToolIntegration:
 
         # Call with low max_iterations
         with patch("subprocess.run") as mock_subprocess:
-            mock_subprocess.return_value = Mock(
-                returncode=0, stdout="output", stderr=""
-            )
+            mock_subprocess.return_value = _stub_completed_process("output")
 
             response = agent.chat_with_tools("loop", max_tool_iterations=3)
 
         # Should have called chat_completion exactly 3 times
-        assert mock_client.chat_completion.call_count == 3
+        assert mock_ai_client.chat_completion.call_count == 3
+
+    def test_chat_with_tools_reuses_schemas(self, mock_ai_client):
+        """Test tool schemas are built once until the tool list changes."""
+        mock_ai_client.chat_completion.return_value = _stub_response("Done")
+
+        agent = TestAgent(
+            name="test_agent",
+            enable_tools=True,
+            tools=["bash"],
+        )
+
+        with patch.object(
+            ToolRegistry, "get_schemas", wraps=ToolRegistry.get_schemas
+        ) as mock_get_schemas:
+            agent.chat_with_tools("first")
+            agent.chat_with_tools("second")
+            assert mock_get_schemas.call_count == 1
+
+            agent.available_tools.append("file_read")
+            agent.chat_with_tools("third")
+            assert mock_get_schemas.call_count == 2
+
+        first_tools, last_tools = (
+            call.kwargs["tools"]
+            for call in mock_ai_client.chat_completion.call_args_list[::2]
+        )
+        assert [s["function"]["name"] for s in first_tools] == ["bash"]
+        assert [s["function"]["name"] for s in last_tools] == ["bash", "file_read"]
+
+    def test_chat_with_tools_parses_repeated_arguments_once(self, mock_ai_client):
+        """Test identical tool-call arguments are parsed once per loop."""
+        mock_ai_client.chat_completion.return_value = _stub_response(
+            "Looping...",
+            tool_calls=[_stub_tool_call("call_123", "bash", '{"command": "echo loop"}')],
+        )
+
+        agent = TestAgent(name="test_agent", enable_tools=True, tools=["bash"])
+
+        with patch("subprocess.run") as mock_subprocess, patch(
+            "src.core.agent._loads_json", wraps=agent_module._loads_json
+        ) as mock_loads:
+            mock_subprocess.return_value = _stub_completed_process("output")
+            agent.chat_with_tools("loop", max_tool_iterations=3)
+
+        assert mock_loads.call_count == 1
+        assert mock_subprocess.call_count == 3
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_tool_arguments_parse_with_and_without_orjson(self, use_orjson):
+        """Test argument parsing falls back to the json module."""
+        if use_orjson:
+            pytest.importorskip("orjson")
+            parser = agent_module.orjson
+        else:
+            parser = None
+
+        with patch.object(agent_module, "orjson", parser):
+            assert agent_module._loads_json('{"command": "ls", "n": [1, 2]}') == {
+                "command": "ls",
+                "n": [1, 2],
+            }
+            with pytest.raises(json.JSONDecodeError):
+                agent_module._loads_json("{not json")
 
 
 if __name__ == "__main__":